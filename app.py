@@ -6,26 +6,22 @@
 # ├── requirements.txt
 # └── data/  (folder for JSON files)
 
-import base64
-import json
-import os
-import re
 import streamlit as st
+from data_manager import save_data_as_json, load_chart, chart_exists, search_charts, search_charts_page, latest_chart, allocate_placeholder_id
+from chart_codec import decode as decode_chart, encode as encode_chart
+from measurement import format_mm
+from chart_derived import DERIVED_KEY, derived_for, form_inputs, mm_by_index, oriented
+from chart_assets import missing_assets
+from chart_overlay import chart_overlay, image_src, overlay_edits
 
 st.set_page_config(layout="wide")
 
-# Load SVG images and encode to base64 for embedding in HTML
+# SVG images: cached once per process and served as static assets by chart_assets
 CHART_SVG_PATH = "chart.svg"
 CHART_THUMBLESS_PATH = "chart_thumbless.svg"
-if not os.path.exists(CHART_SVG_PATH) or not os.path.exists(CHART_THUMBLESS_PATH):
+if missing_assets([CHART_SVG_PATH, CHART_THUMBLESS_PATH]):
     st.error("Required SVG files not found. Please ensure chart.svg and chart_thumbless.svg are present.")
     st.stop()
-with open(CHART_SVG_PATH, "rb") as f:
-    chart_svg_data = f.read()
-with open(CHART_THUMBLESS_PATH, "rb") as f:
-    chart_thumbless_data = f.read()
-chart_svg_base64 = base64.b64encode(chart_svg_data).decode('utf-8')
-chart_thumbless_base64 = base64.b64encode(chart_thumbless_data).decode('utf-8')
 
 # Define field placeholders and absolute positions (matching original chart_widget.py coordinates)
 placeholders = [
@@ -45,49 +41,57 @@ input_positions = [
 hole_indices = {0, 4, 10}
 cut_indices = {15, 16}
 thumbless_hidden_indices = [8, 9, 10, 11, 12, 13, 14, 15, 16]  # fields to hide in Thumbless mode
+LOAD_PAGE_SIZE = 30  # 불러오기 목록 한 페이지에 보여줄 고객 수
+FIELD_KEYS = {f"field{i}" for i in range(len(placeholders))}
+
+
+def field_style(idx):
+    # 입력칸 style: positioned over chart, transparent background, bold text
+    x, y = input_positions[idx]  # positions are already relative to container
+    style = "position: absolute; left: {left}px; top: {top}px; width: {w}px; height: {h}px; background: transparent; color: black; border: none; font-weight: bold; text-align: center;"
+    # Adjust size/font for specific fields
+    if idx in [1, 2, 3, 5, 6, 7, 11, 12, 13, 14]:
+        style += " font-size: 13pt;"
+    elif idx in cut_indices or idx >= 15:
+        style += " width: 70px; height: 40px; font-size: 12pt;"
+    elif idx in hole_indices:
+        if idx == 10:
+            style += " width: 180px; height: 50px; font-size: 16pt;"
+        else:
+            style += " width: 90px; height: 50px; font-size: 18pt;"
+    else:
+        style += " width: 90px; height: 50px; font-size: 16pt;"
+    return style.format(left=x, top=y, w=90, h=50)
+
+
+def coord_layout():
+    # 좌표칸 4개 (first_x, first_y, second_x, second_y) - "엄지라이트" 칸 기준 위치
+    thumb_x, thumb_y = input_positions[12]
+    coord_style = "position: absolute; width: 80px; height: 30px; background: lightgray; color: black; font-weight: bold; text-align: center;"
+    fx_left = thumb_x + 18
+    fx_top = thumb_y - 80
+    fy_top = fx_top + 30 + 3
+    sx_left = fx_left + 80 + 20
+    return [f"{coord_style} left: {left}px; top: {top}px;"
+            for left, top in ((fx_left, fx_top), (fx_left, fy_top), (sx_left, fx_top), (sx_left, fy_top))]
+
+
+# 오버레이 배치는 바뀌지 않으므로 한 번만 만든다 (컴포넌트에도 처음 한 번만 보낸다)
+OVERLAY_LAYOUT = [field_style(idx) for idx in range(len(placeholders))]
+COORD_LAYOUT = coord_layout()
+
+
+def apply_chart_to_session(data):
+    # 불러온 차트를 입력칸/세션 값에 채우기 (자동 로드, 불러오기 공용)
+    form = decode_chart(data)
+    st.session_state.name = form["name"]
+    st.session_state.id = form["cid"]
+    for i, value in enumerate(form["fields"]):
+        st.session_state[f"field{i}"] = value
+    for key in ("pap_x", "pap_y", "layout", "tilt", "rotation", "memo", "hand", "grip"):
+        st.session_state[key] = form[key]
+    st.session_state.derived = data.get(DERIVED_KEY)
 
-# 엄지홀 오블롱 변환 함수 (45도 각도에서 inch -> mm 변환)
-def parse_thumb_oblong_strict(value: str) -> str:
-    try:
-        if ">" in value:
-            base, after = value.split(">")
-            if "))" in after:
-                after, after_barbell = after.split("))")
-                after_barbell = "))" + after_barbell
-            else:
-                after_barbell = ""
-            valid_range = range(33, 96)
-            def get_64_value(val_str):
-                if '.' in val_str:
-                    return None  # 이미 mm로 변환된 값은 처리 안 함
-                val_int = int(val_str)
-                if val_int in valid_range:
-                    return val_int
-                for f in [2, 4, 8, 16]:
-                    candidate = val_int * f
-                    if candidate in valid_range:
-                        return candidate
-                return None
-            before_64 = get_64_value(base.strip())
-            after_64 = get_64_value(after.strip())
-            if before_64 is None or after_64 is None:
-                return value
-            diff = abs(after_64 - before_64)
-            move = (diff / 2) / 64  # inch (64분할 값의 절반)
-            mm = round(move * 25.4 * 0.7071, 2)  # 45도 오블롱 변환 (0.7071 배율)
-            return f"{base}>{mm:.2f}{after_barbell}"
-    except Exception as e:
-        print(f"엄지홀 변환 오류: {e}")
-    return value
-
-# JSON 저장 유틸 함수
-def save_data_as_json(name, cid, data, folder="data"):
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    filename = f"{name}_{cid}.json"
-    filepath = os.path.join(folder, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
 
 # 세션 상태 초기화 (최초 실행 시)
 if "initialized" not in st.session_state:
@@ -99,6 +103,7 @@ if "initialized" not in st.session_state:
     st.session_state.convert_mode = False
     st.session_state.original_values = {}
     st.session_state.base_coords = {}  # stores fx, fy, sx, sy after conversion
+    st.session_state.derived = None  # 불러온 차트에 저장된 변환값
     # Initialize all field values to empty
     for i in range(len(placeholders)):
         st.session_state[f"field{i}"] = ""
@@ -113,76 +118,26 @@ if "initialized" not in st.session_state:
     st.session_state.rotation = ""
     st.session_state.memo = ""
     # 자동으로 가장 최근 JSON 파일 불러오기 (마지막 저장 데이터 로드)
-    data_folder = "data"
-    if os.path.isdir(data_folder):
-        json_files = [f for f in os.listdir(data_folder) if f.endswith(".json")]
-        if json_files:
-            # sort by last modified time, descending
-            json_files.sort(key=lambda x: os.path.getmtime(os.path.join(data_folder, x)), reverse=True)
-            latest_file = json_files[0]
-            try:
-                with open(os.path.join(data_folder, latest_file), "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                # Load name/ID and all fields from JSON
-                st.session_state.name = data.get("이름", "")
-                st.session_state.id = data.get("전화번호뒷자리", "")
-                if "중지" in data:
-                    st.session_state.field0 = data["중지"].get("사이즈", "")
-                    st.session_state.field1 = data["중지"].get("피치", {}).get("left", "")
-                    st.session_state.field2 = data["중지"].get("피치", {}).get("reverse", "")
-                    st.session_state.field3 = data["중지"].get("피치", {}).get("forward", "")
-                if "약지" in data:
-                    st.session_state.field4 = data["약지"].get("사이즈", "")
-                    st.session_state.field5 = data["약지"].get("피치", {}).get("right", "")
-                    st.session_state.field6 = data["약지"].get("피치", {}).get("reverse", "")
-                    st.session_state.field7 = data["약지"].get("피치", {}).get("forward", "")
-                if "스팬" in data:
-                    st.session_state.field8 = data["스팬"].get("중지", "")
-                    st.session_state.field9 = data["스팬"].get("약지", "")
-                if "엄지" in data:
-                    st.session_state.field10 = data["엄지"].get("사이즈", "")
-                    st.session_state.field11 = data["엄지"].get("피치", {}).get("left", "")
-                    st.session_state.field12 = data["엄지"].get("피치", {}).get("right", "")
-                    st.session_state.field13 = data["엄지"].get("피치", {}).get("reverse", "")
-                    st.session_state.field14 = data["엄지"].get("피치", {}).get("forward", "")
-                if "CUT" in data:
-                    st.session_state.field15 = data["CUT"].get("중약지", "")
-                    st.session_state.field16 = data["CUT"].get("엄지", "")
-                st.session_state.field17 = data.get("브릿지", "")
-                pap_data = data.get("PAP", {})
-                if isinstance(pap_data, dict):
-                    st.session_state.pap_x = pap_data.get("수평", "")
-                    st.session_state.pap_y = pap_data.get("수직", "")
-                elif isinstance(pap_data, str):
-                    # handle older format "X - Y"
-                    match = re.match(r"([\d\s\/\.]+)\s*-\s*([\d\s\/\.]+)", pap_data)
-                    if match:
-                        st.session_state.pap_x = match.group(1).strip()
-                        st.session_state.pap_y = match.group(2).strip()
-                    else:
-                        st.session_state.pap_x = ""
-                        st.session_state.pap_y = ""
-                st.session_state.layout = data.get("레이아웃", "")
-                st.session_state.tilt = data.get("틸트", "")
-                st.session_state.rotation = data.get("로테이션", "")
-                st.session_state.memo = data.get("메모", "")
-                st.session_state.hand = data.get("hand", "오른손")
-                grip_mode = data.get("grip", data.get("그립방식", "클래식"))
-                st.session_state.grip = grip_modee
-
-                # 🔒 안전 보장: 누락된 키 미리 초기화 (예방 목적)
-                if "center_toggle" not in st.session_state:
-                    st.session_state.center_toggle = False
+    # 저장소가 저장할 때마다 갱신하는 최근 목록에서 바로 꺼낸다 (파일 수와 무관)
+    latest_key = latest_chart()
+    if latest_key:
+        try:
+            data = load_chart(latest_key)
+            apply_chart_to_session(data)
 
-                # 모드 정리
-                st.session_state.edit_mode = False
-                st.session_state.load_mode = False
+            # 🔒 안전 보장: 누락된 키 미리 초기화 (예방 목적)
+            if "center_toggle" not in st.session_state:
+                st.session_state.center_toggle = False
 
-                # ✅ rerun은 맨 마지막에
-                st.rerun()
+            # 모드 정리
+            st.session_state.edit_mode = False
+            st.session_state.load_mode = False
 
-            except Exception as e:
-                print("자동 로드 실패:", e)
+            # ✅ rerun은 맨 마지막에
+            st.rerun()
+
+        except Exception as e:
+            print("자동 로드 실패:", e)
 
 # Utility: revert conversion (restore original inch values if currently converted)
 def revert_conversion():
@@ -192,6 +147,41 @@ def revert_conversion():
     st.session_state.original_values.clear()
     st.session_state.base_coords.clear()
 
+def coord_texts():
+    # If not converted yet, just show placeholder "x = "
+    if not st.session_state.convert_mode:
+        return ["x = ", "y = ", "x = ", "y = "]
+    base = {k: st.session_state.base_coords.get(k, 0.0) for k in ("fx", "fy", "sx", "sy")}
+    first_x, first_y, second_x, second_y = oriented(base, st.session_state.get("center_toggle", False))
+    return [f"x = {first_x:.2f}", f"y = {first_y:.2f}", f"x = {second_x:.2f}", f"y = {second_y:.2f}"]
+
+
+def overlay_state():
+    # 차트 오버레이 컴포넌트에 보여줄 값 (바뀐 값만 chart_overlay가 보낸다)
+    thumbless = st.session_state.grip == "덤리스"
+    state = {
+        "layout": OVERLAY_LAYOUT,
+        "coord_layout": COORD_LAYOUT,
+        "placeholders": placeholders,
+        # Choose the appropriate SVG image (classic or thumbless) - served from a content-hashed static URL
+        "svg": image_src(CHART_THUMBLESS_PATH if thumbless else CHART_SVG_PATH),
+        # Container height (SVG height + top offset 90px for header area)
+        "height": (286 + 90) if thumbless else (757 + 90),
+        "hidden": thumbless_hidden_indices if thumbless else [],
+        # Coordinate output fields (only for Classic mode)
+        "coords": [] if thumbless else coord_texts(),
+        "editable": st.session_state.edit_mode,
+    }
+    for i in range(len(placeholders)):
+        state[f"field{i}"] = st.session_state.get(f"field{i}", "")
+    return state
+
+
+# 차트 오버레이에서 고친 입력칸 값 반영 (편집 모드에서만 화면이 보낸다)
+for field_key, value in overlay_edits().items():
+    if field_key in FIELD_KEYS and st.session_state.edit_mode:
+        st.session_state[field_key] = value
+
 # Top control bar: Name/ID display, Hand/Grip radios, and action buttons
 top_cols = st.columns([0.6, 0.6, 0.6, 0.4, 0.2, 0.4])
 col_name, col_id, col_hand, col_grip, col_load, col_edit_new = top_cols
@@ -253,68 +243,13 @@ else:
             # Save original values for all relevant fields
             for i in pitch_indices + size_indices + [thumb_index]:
                 st.session_state.original_values[i] = st.session_state[f"field{i}"]
-            # Conversion helper functions
-            def convert_fraction(val_str):
-                if not val_str:
-                    return None
-                s = val_str.strip().lower()
-                if "mm" in s:
-                    return None
-                try:
-                    if ' ' in s and '/' in s:
-                        whole, frac = s.split()
-                        num, den = frac.split('/')
-                        return int(whole) + int(num)/int(den)
-                    elif '/' in s:
-                        num, den = s.split('/')
-                        return int(num)/int(den)
-                    else:
-                        return float(s)
-                except:
-                    return None
-            def inch_to_mm(inch_val):
-                return round(inch_val * 25.4, 2)
-            # Convert pitch fields to mm
-            for i in pitch_indices:
-                raw = st.session_state[f"field{i}"].strip()
-                val_inch = convert_fraction(raw)
-                if val_inch is not None:
-                    st.session_state[f"field{i}"] = f"{inch_to_mm(val_inch):.2f} mm"
-            # Convert thumb hole oval value
-            st.session_state[f"field{thumb_index}"] = parse_thumb_oblong_strict(st.session_state[f"field{thumb_index}"].strip())
-            # Calculate coordinates (fx, fy, sx, sy in mm)
-            def get_mm(index):
-                raw = st.session_state[f"field{index}"].replace("mm", "").strip()
-                try:
-                    return float(raw)
-                except:
-                    return 0.0
-            left_mm = get_mm(11)
-            right_mm = get_mm(12)
-            reverse_mm = get_mm(13)
-            forward_mm = get_mm(14)
-            thumb_raw = st.session_state.field10
-            thumb_mm = 0.0
-            if ">" in thumb_raw:
-                try:
-                    mm_part = thumb_raw.split(">")[1]
-                    mm_vals = re.findall(r"[\d\.]+", mm_part)
-                    if mm_vals:
-                        thumb_mm = float(mm_vals[0])
-                except:
-                    thumb_mm = 0.0
-            # Determine coordinates based on hand (오른손/왼손)
-            if st.session_state.hand == "왼손":
-                fx = right_mm - left_mm - thumb_mm
-                fy = forward_mm - reverse_mm - thumb_mm
-                sx = right_mm - left_mm + thumb_mm
-                sy = forward_mm - reverse_mm + thumb_mm
-            else:  # 오른손
-                fx = right_mm - left_mm - thumb_mm
-                fy = forward_mm - reverse_mm + thumb_mm
-                sx = right_mm - left_mm + thumb_mm
-                sy = forward_mm - reverse_mm - thumb_mm
-            st.session_state.base_coords = {"fx": fx, "fy": fy, "sx": sx, "sy": sy}
+            # mm 값/엄지홀/좌표: 불러온 차트에 저장된 변환값이 지금 입력과 같으면 그대로 쓴다
+            fields = [st.session_state.get(f"field{i}", "") for i in range(len(placeholders))]
+            derived = derived_for(form_inputs(fields, st.session_state.hand), st.session_state.get("derived"))
+            for i, mm in mm_by_index(derived).items():
+                st.session_state[f"field{i}"] = format_mm(mm)
+            st.session_state[f"field{thumb_index}"] = derived["엄지홀"]
+            st.session_state.base_coords = dict(derived["좌표"])
             st.session_state.convert_mode = True
         else:
             # If already in converted state, revert to original values
@@ -326,67 +261,21 @@ if st.session_state.load_mode:
     st.markdown("---")
     st.subheader("고객 차트 불러오기")
     search = st.text_input("이름 또는 전화번호 뒷자리 검색", key="search_term")
-    data_folder = "data"
-    all_files = [f[:-5] for f in os.listdir(data_folder) if f.endswith(".json")] if os.path.isdir(data_folder) else []
-    filtered = [f for f in all_files if search in f]
+    # 검색어가 바뀌면 첫 페이지부터
+    if st.session_state.get("load_search") != search:
+        st.session_state.load_search = search
+        st.session_state.load_page = 0
+    total, filtered = search_charts_page(search, st.session_state.load_page, LOAD_PAGE_SIZE)
     for fname in filtered:
         if st.button(fname, key=fname):
-            file_path = os.path.join(data_folder, fname + ".json")
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = load_chart(fname)
             except Exception as e:
                 st.error("파일을 불러올 수 없습니다.")
                 st.session_state.load_mode = False
                 break
             # Apply loaded data to session state
-            st.session_state.name = data.get("이름", "")
-            st.session_state.id = data.get("전화번호뒷자리", "")
-            # Clear all fields
-            for i in range(len(placeholders)):
-                st.session_state[f"field{i}"] = ""
-            if "중지" in data:
-                st.session_state.field0 = data["중지"].get("사이즈", "")
-                st.session_state.field1 = data["중지"].get("피치", {}).get("left", "")
-                st.session_state.field2 = data["중지"].get("피치", {}).get("reverse", "")
-                st.session_state.field3 = data["중지"].get("피치", {}).get("forward", "")
-            if "약지" in data:
-                st.session_state.field4 = data["약지"].get("사이즈", "")
-                st.session_state.field5 = data["약지"].get("피치", {}).get("right", "")
-                st.session_state.field6 = data["약지"].get("피치", {}).get("reverse", "")
-                st.session_state.field7 = data["약지"].get("피치", {}).get("forward", "")
-            if "스팬" in data:
-                st.session_state.field8 = data["스팬"].get("중지", "")
-                st.session_state.field9 = data["스팬"].get("약지", "")
-            if "엄지" in data:
-                st.session_state.field10 = data["엄지"].get("사이즈", "")
-                st.session_state.field11 = data["엄지"].get("피치", {}).get("left", "")
-                st.session_state.field12 = data["엄지"].get("피치", {}).get("right", "")
-                st.session_state.field13 = data["엄지"].get("피치", {}).get("reverse", "")
-                st.session_state.field14 = data["엄지"].get("피치", {}).get("forward", "")
-            if "CUT" in data:
-                st.session_state.field15 = data["CUT"].get("중약지", "")
-                st.session_state.field16 = data["CUT"].get("엄지", "")
-            st.session_state.field17 = data.get("브릿지", "")
-            pap_data = data.get("PAP", {})
-            if isinstance(pap_data, dict):
-                st.session_state.pap_x = pap_data.get("수평", "")
-                st.session_state.pap_y = pap_data.get("수직", "")
-            elif isinstance(pap_data, str):
-                match = re.match(r"([\d\s\/\.]+)\s*-\s*([\d\s\/\.]+)", pap_data)
-                if match:
-                    st.session_state.pap_x = match.group(1).strip()
-                    st.session_state.pap_y = match.group(2).strip()
-                else:
-                    st.session_state.pap_x = ""
-                    st.session_state.pap_y = ""
-            st.session_state.layout = data.get("레이아웃", "")
-            st.session_state.tilt = data.get("틸트", "")
-            st.session_state.rotation = data.get("로테이션", "")
-            st.session_state.memo = data.get("메모", "")
-            st.session_state.hand = data.get("hand", "오른손")
-            grip_mode = data.get("grip", data.get("그립방식", "클래식"))
-            st.session_state.grip = grip_mode
+            apply_chart_to_session(data)
 
             # 🔒 안전 보장: 누락된 키 미리 초기화 (예방 목적)
             if "center_toggle" not in st.session_state:
@@ -399,6 +288,17 @@ if st.session_state.load_mode:
             # ✅ rerun은 맨 마지막에
             st.rerun()
 
+    # 페이지 이동 (현재 페이지의 버튼만 렌더링)
+    page_count = max(1, (total + LOAD_PAGE_SIZE - 1) // LOAD_PAGE_SIZE)
+    col_prev, col_page, col_next = st.columns([0.2, 0.6, 0.2])
+    if col_prev.button("◀ 이전", key="load_prev", disabled=st.session_state.load_page == 0):
+        st.session_state.load_page -= 1
+        st.rerun()
+    col_page.markdown(f"{st.session_state.load_page + 1} / {page_count} 페이지 (총 {total}건)")
+    if col_next.button("다음 ▶", key="load_next", disabled=st.session_state.load_page >= page_count - 1):
+        st.session_state.load_page += 1
+        st.rerun()
+
     if st.button("취소", key="cancel_load"):
         st.session_state.load_mode = False
         st.rerun()
@@ -410,10 +310,8 @@ if st.session_state.new_mode:
     new_name = st.text_input("이름", key="new_name")
     new_id = st.text_input("전화번호 뒷자리", key="new_id")
     # Show existing files matching input (for user reference)
-    data_folder = "data"
-    all_files = [f for f in os.listdir(data_folder) if f.endswith(".json")] if os.path.isdir(data_folder) else []
     filter_str = f"{new_name.strip()}_{new_id.strip()}" if new_name or new_id else ""
-    filtered = [f for f in all_files if filter_str and filter_str in f]
+    filtered = [f"{k}.json" for k in search_charts(filter_str, LOAD_PAGE_SIZE)] if filter_str else []
     st.write("저장된 파일 목록:")
     st.write(", ".join(filtered) if filtered else "(검색 결과 없음)")
     col_cnf, col_cancel = st.columns(2)
@@ -422,8 +320,7 @@ if st.session_state.new_mode:
             st.warning("이름과 전화번호를 모두 입력하세요.")
         else:
             filename = f"{new_name.strip()}_{new_id.strip()}.json"
-            filepath = os.path.join(data_folder, filename)
-            if os.path.exists(filepath):
+            if chart_exists(new_name.strip(), new_id.strip()):
                 st.error(f"이미 존재하는 파일: {filename}")
             else:
                 # Initialize new chart data
@@ -457,15 +354,15 @@ if st.session_state.new_mode:
         st.session_state.new_mode = False
         st.rerun()
 
-# Editing form (if in edit_mode)
+# Chart with overlay fields: 보기/편집 모두 같은 컴포넌트 하나 (재실행마다 다시 띄우지 않는다)
+# 편집 모드에서는 차트 위 입력칸을 바로 고치고, 고친 값만 앱으로 온다
+st.markdown("---")
+st.subheader("차트 데이터 편집" if st.session_state.edit_mode else "차트 보기")
+chart_overlay(overlay_state())
+
+# Editing form (if in edit_mode) - side inputs and save
 if st.session_state.edit_mode:
-    st.markdown("---")
-    st.subheader("차트 데이터 편집")
     with st.form("edit_form", clear_on_submit=False):
-        # 18 overlay fields as input fields in form
-        for idx, placeholder in enumerate(placeholders):
-            st.text_input(placeholder, value=st.session_state.get(f"field{idx}", ""),
-                          key=f"field{idx}", placeholder=placeholder)
         cols_pap = st.columns(2)
         cols_pap[0].text_input("PAP 수평거리", value=st.session_state.pap_x, key="pap_x", placeholder="PAP 수평거리")
         cols_pap[1].text_input("PAP 수직거리", value=st.session_state.pap_y, key="pap_y", placeholder="PAP 수직거리")
@@ -480,47 +377,27 @@ if st.session_state.edit_mode:
         cid = st.session_state.id.strip()
         if not name or not cid:
             base_name = "이름"
-            existing = os.listdir("data") if os.path.isdir("data") else []
-            count = 1
-            while f"{base_name}_{count}.json" in existing:
-                count += 1
+            count = allocate_placeholder_id(base_name)
             if not name:
                 name = f"{base_name}_{count}"
             if not cid:
                 cid = str(count)
             st.session_state.name = name
             st.session_state.id = cid
-        values = [st.session_state.get(f"field{i}", "").strip() for i in range(len(placeholders))]
-        data = {
-            "이름": st.session_state.name,
-            "전화번호뒷자리": st.session_state.id,
-            "중지": {
-                "사이즈": values[0],
-                "피치": {"left": values[1], "reverse": values[2], "forward": values[3]}
-            },
-            "약지": {
-                "사이즈": values[4],
-                "피치": {"right": values[5], "reverse": values[6], "forward": values[7]}
-            },
-            "스팬": {"중지": values[8], "약지": values[9]},
-            "엄지": {
-                "사이즈": values[10],
-                "피치": {
-                    "left": values[11], "right": values[12],
-                    "reverse": values[13], "forward": values[14]
-                }
-            },
-            "PAP": {"수평": st.session_state.pap_x.strip(), "수직": st.session_state.pap_y.strip()},
-            "레이아웃": st.session_state.layout.strip(),
-            "틸트": st.session_state.tilt.strip(),
-            "로테이션": st.session_state.rotation.strip(),
-            "메모": st.session_state.memo,
-            "CUT": {"중약지": values[15], "엄지": values[16]},
-            "브릿지": values[17],
-            "토글상태": st.session_state.get("center_toggle", False),
+        data = encode_chart({
+            "name": st.session_state.name,
+            "cid": st.session_state.id,
+            "fields": [st.session_state.get(f"field{i}", "") for i in range(len(placeholders))],
+            "pap_x": st.session_state.pap_x,
+            "pap_y": st.session_state.pap_y,
+            "layout": st.session_state.layout,
+            "tilt": st.session_state.tilt,
+            "rotation": st.session_state.rotation,
+            "memo": st.session_state.memo,
+            "toggle": st.session_state.get("center_toggle", False),
             "hand": st.session_state.hand,
-            "grip": st.session_state.grip
-        }
+            "grip": st.session_state.grip,
+        })
         save_data_as_json(name, cid, data)
         st.success(f"{name}_{cid}.json 저장 완료")
         st.session_state.edit_mode = False
@@ -528,78 +405,8 @@ if st.session_state.edit_mode:
             revert_conversion()
         st.rerun()
 
-# Display chart with overlay fields (view mode)
+# Side inputs (view mode)
 if not st.session_state.edit_mode:
-    st.markdown("---")
-    st.subheader("차트 보기")
-    # Choose the appropriate SVG image (classic or thumbless)
-    current_svg_data = chart_svg_base64 if st.session_state.grip != "덤리스" else chart_thumbless_base64
-    # Determine container height (SVG height + top offset 90px for header area)
-    container_height = (757 + 90) if st.session_state.grip != "덤리스" else (286 + 90)
-    html = f'''
-    <div style="position: relative; width: 541px; height: {container_height}px; background-color: white;">
-        <img src="data:image/svg+xml;base64,{current_svg_data}" style="position: absolute; top: 90px; left: 0px; width: 541px;"/>
-    '''
-    # Overlay each field value as a positioned input (read-only)
-    for idx, (x, y) in enumerate(input_positions):
-        if st.session_state.grip == "덤리스" and idx in thumbless_hidden_indices:
-            continue  # skip hidden fields in thumbless mode
-        value = st.session_state.get(f"field{idx}", "")
-        display_value = value if value else ""
-        placeholder_attr = placeholders[idx] if not value else ""
-        # Base style: positioned over chart, transparent background, bold text
-        style = "position: absolute; left: {left}px; top: {top}px; width: {w}px; height: {h}px; background: transparent; color: black; border: none; font-weight: bold; text-align: center;"
-        # Adjust size/font for specific fields
-        if idx in [1, 2, 3, 5, 6, 7, 11, 12, 13, 14]:
-            style += " font-size: 13pt;"
-        elif idx in cut_indices or idx >= 15:
-            style += " width: 70px; height: 40px; font-size: 12pt;"
-        elif idx in hole_indices:
-            if idx == 10:
-                style += " width: 180px; height: 50px; font-size: 16pt;"
-            else:
-                style += " width: 90px; height: 50px; font-size: 18pt;"
-        else:
-            style += " width: 90px; height: 50px; font-size: 16pt;"
-        top_offset = y  # positions are already relative to container
-        left_offset = x
-        style = style.format(left=left_offset, top=top_offset, w=90, h=50)
-        html += f'<input type="text" value="{display_value}" placeholder="{placeholder_attr}" readonly style="{style}"/>'
-    # Coordinate output fields (only for Classic mode)
-    if st.session_state.grip != "덤리스":
-        thumb_x, thumb_y = input_positions[12]  # "엄지라이트" reference position
-        base_fx = st.session_state.base_coords.get("fx", 0.0)
-        base_fy = st.session_state.base_coords.get("fy", 0.0)
-        base_sx = st.session_state.base_coords.get("sx", 0.0)
-        base_sy = st.session_state.base_coords.get("sy", 0.0)
-        if st.session_state.get("center_toggle", False):
-            first_x_text = f"x = {base_fy:.2f}"
-            first_y_text = f"y = {-base_fx:.2f}"
-            second_x_text = f"x = {base_sy:.2f}"
-            second_y_text = f"y = {-base_sx:.2f}"
-        else:
-            first_x_text = f"x = {base_fx:.2f}"
-            first_y_text = f"y = {base_fy:.2f}"
-            second_x_text = f"x = {base_sx:.2f}"
-            second_y_text = f"y = {base_sy:.2f}"
-        # If not converted yet, just show placeholder "x = "
-        if not st.session_state.convert_mode:
-            first_x_text = "x = "
-            first_y_text = "y = "
-            second_x_text = "x = "
-            second_y_text = "y = "
-        coord_style = "position: absolute; width: 80px; height: 30px; background: lightgray; color: black; font-weight: bold; text-align: center;"
-        fx_left = thumb_x + 18
-        fx_top = thumb_y - 80
-        fy_top = fx_top + 30 + 3
-        sx_left = fx_left + 80 + 20
-        html += f'<input type="text" value="{first_x_text}" readonly style="{coord_style} left: {fx_left}px; top: {fx_top}px;"/>'
-        html += f'<input type="text" value="{first_y_text}" readonly style="{coord_style} left: {fx_left}px; top: {fy_top}px;"/>'
-        html += f'<input type="text" value="{second_x_text}" readonly style="{coord_style} left: {sx_left}px; top: {fx_top}px;"/>'
-        html += f'<input type="text" value="{second_y_text}" readonly style="{coord_style} left: {sx_left}px; top: {fy_top}px;"/>'
-    html += "</div>"
-    # Render the HTML with embedded SVG and overlay inputs
-    st.components.v1.html(html, height=container_height + 20)
     # Sidebar-equivalent panel for side inputs (PAP, layout, etc.) in view mode
     side_col = st.columns(1)[0]
     pap_cols = side_col.columns(2)
@@ -0,0 +1,80 @@
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import fcntl
+except ImportError:  # 윈도우
+    fcntl = None
+    import msvcrt
+
+# 안전한 파일 저장
+# 같은 폴더의 임시 파일에 쓰고 fsync 한 다음 os.replace로 바꿔치기 하므로
+# 저장 도중 프로그램이 죽어도 기존 파일이 반쯤 잘린 상태로 남지 않는다.
+
+
+def _tmp_path(path):
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def fsync_dir(folder):
+    # 파일 이름 변경(rename)까지 디스크에 남기기 (윈도우는 폴더 fsync 불가)
+    if os.name == "nt":
+        return
+    fd = os.open(folder or ".", os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(path):
+    # 여러 프로세스가 같이 고치는 파일용 배타 lock (path + ".lock" 파일을 잠근다, 풀릴 때까지 기다림)
+    with open(path + ".lock", "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _write_tmp(path, payload):
+    tmp = _tmp_path(path)
+    with open(tmp, "wb") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
+
+
+def write_atomic(path, payload, lock=None, replace_if=None):
+    # lock / replace_if: 임시 파일을 다 쓰고 fsync 한 뒤, lock을 잡은 채로 replace_if(임시 파일 경로)가
+    # True일 때만 바로 바꿔치기 (느린 fsync는 lock 밖에서, 확인과 rename은 연달아). 바꾸지 않았으면 False
+    tmp = _write_tmp(path, payload)
+    try:
+        with lock if lock is not None else nullcontext():
+            if replace_if is not None and not replace_if(tmp):
+                os.remove(tmp)
+                return False
+            os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    fsync_dir(os.path.dirname(path))
+    return True
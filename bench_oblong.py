@@ -0,0 +1,68 @@
+import random
+import sys
+import time
+
+import numpy as np
+
+from batch_convert import thumb_column
+from bench_measurement import old_oblong, old_thumb_mm
+from measurement import convert_oblong, thumb_mm
+
+# 엄지홀 오블롱 변환: 예전 함수(parse_thumb_oblong_strict)와 표(OBLONG_TABLE) 방식 비교
+# 사용법: python bench_oblong.py [문자열 개수]
+# - 확인: 0~130 모든 (앞, 뒤) 조합과 공백/바벨/소수/잘못된 값이 섞인 무작위 문자열에서
+#   convert_oblong, thumb_mm, batch_convert.thumb_column 결과가 예전과 같은지
+# - 속도: 캐시 없이 한 건씩 (예전 / 표), 배열 한 번에 (thumb_column)
+
+
+def exhaustive():
+    for before in range(131):
+        for after in range(131):
+            yield f"{before}>{after}"
+            yield f"{before}>{after}))1"
+
+
+def fuzz(n, seed=7):
+    rng = random.Random(seed)
+    parts = ["", " ", "63", "61", "0", "7", "96", "200", "0.28", "1.5", "x", "-3", "3/4"]
+    tails = ["", "))", "))2", "))2))3", ")", ">", " "]
+    for _ in range(n):
+        yield rng.choice(parts) + rng.choice(["", ">", " > "]) + rng.choice(parts) + rng.choice(tails)
+
+
+def check(strings):
+    for s in strings:
+        assert convert_oblong(s) == old_oblong(s), s
+        assert thumb_mm(s) == old_thumb_mm(s), s
+    vector = thumb_column(strings)
+    expected = np.array([old_thumb_mm(s) for s in strings])
+    assert np.array_equal(vector, expected)
+
+
+def per_call(fn, items):
+    start = time.perf_counter()
+    for s in items:
+        fn(s)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    check(list(exhaustive()))
+    check(list(fuzz(20000)))
+    print("모든 (앞, 뒤) 조합 0~130, 무작위 20000개: 결과 일치")
+
+    rng = random.Random(1)
+    items = [f"{rng.randint(40, 80)}>{rng.randint(40, 80)}" + rng.choice(["", "))2"]) for _ in range(n)]
+    # 캐시 효과를 빼고 한 건 계산 시간만 비교
+    kernel = convert_oblong.__wrapped__
+    print(f"{'예전 함수':14} {per_call(old_oblong, items):8.3f} us/건")
+    print(f"{'표 (캐시 없음)':14} {per_call(kernel, items):8.3f} us/건")
+    print(f"{'표 (캐시)':14} {per_call(convert_oblong, items):8.3f} us/건")
+    start = time.perf_counter()
+    thumb_column(items)
+    print(f"{'배열 (mm)':14} {(time.perf_counter() - start) / n * 1e6:8.3f} us/건")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import random
+import sys
+import time
+
+from search_index import ChartSearchIndex, has_chosung
+
+# 검색 벤치마크: 기존 방식(전체 파일 이름 부분 문자열 비교) vs 검색 인덱스
+# 사용법: python bench_search.py [고객 수]
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류홍"
+SYLLABLES = "민서지현준우하은도윤예진수아영호성연태경감인"
+
+
+def make_keys(n, seed=0):
+    rng = random.Random(seed)
+    keys = set()
+    while len(keys) < n:
+        name = rng.choice(SURNAMES) + "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(1, 2)))
+        if rng.random() < 0.1:
+            name += rng.choice("CT")
+        keys.add(f"{name}_{rng.randint(0, 9999):04d}")
+    return sorted(keys)
+
+
+def timeit(fn, queries, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for q in queries:
+            fn(q)
+    return (time.perf_counter() - start) / (repeat * len(queries))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    keys = make_keys(n)
+    queries = ["신", "감", "C", "T", "7", "_", "신현", "신현감", "현감", "8781", "87", "김민_1", "박서준C", "ㅅㅎㄱ", "신ㅎㄱ"]
+
+    start = time.perf_counter()
+    index = ChartSearchIndex()
+    index.build(keys)
+    build = time.perf_counter() - start
+
+    for q in queries:
+        assert index.matches(q) == [k for k in keys if q in k] or has_chosung(q), q
+
+    linear = timeit(lambda q: [k for k in keys if q in k][:50], queries, 5)
+    indexed = timeit(lambda q: index.search(q, 50), queries, 50)
+    print(f"고객 수: {n}, 인덱스 생성: {build * 1000:.1f} ms")
+    print(f"선형 검색:   {linear * 1000:.3f} ms/query")
+    print(f"인덱스 검색: {indexed * 1000:.3f} ms/query (상위 50개)")
+    for q in queries:
+        t = timeit(lambda q: index.search(q, 50), [q], 50)
+        print(f"  {q!r:12} {t * 1000:.3f} ms, {len(index.matches(q))}건")
+
+
+if __name__ == "__main__":
+    main()
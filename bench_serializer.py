@@ -0,0 +1,46 @@
+import os
+import sys
+import time
+
+from serializer import SERIALIZERS
+
+# 직렬화 방식 비교: data/ 폴더 차트들로 저장/읽기 시간과 파일 크기
+# 사용법: python bench_serializer.py [data 폴더] [반복 횟수]
+
+
+def load_samples(folder):
+    samples = []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(".json"):
+            with open(os.path.join(folder, name), "rb") as f:
+                samples.append(SERIALIZERS["pretty"]().loads(f.read()))
+    return samples
+
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else "data"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    samples = load_samples(folder)
+    print(f"샘플 {len(samples)}개 x {repeat}회")
+    print(f"{'방식':10} {'저장(us/건)':>12} {'읽기(us/건)':>12} {'크기(bytes)':>12}")
+    for name, cls in SERIALIZERS.items():
+        ser = cls()
+        encoded = [ser.dumps(d) for d in samples]
+        for raw, d in zip(encoded, samples):
+            assert ser.loads(raw) == d
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for d in samples:
+                ser.dumps(d)
+        enc = (time.perf_counter() - start) / (repeat * len(samples))
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for raw in encoded:
+                ser.loads(raw)
+        dec = (time.perf_counter() - start) / (repeat * len(samples))
+        size = sum(len(raw) for raw in encoded)
+        print(f"{name:10} {enc * 1e6:12.1f} {dec * 1e6:12.1f} {size:12d}")
+
+
+if __name__ == "__main__":
+    main()
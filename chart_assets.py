@@ -0,0 +1,107 @@
+import base64
+import hashlib
+import os
+import threading
+
+from atomic_write import write_atomic
+
+# 차트 배경 SVG (chart.svg, chart_thumbless.svg) 캐시 (프로세스 전체 공유)
+# Streamlit은 화면을 누를 때마다 app.py를 처음부터 다시 실행하므로,
+# 파일 읽기와 base64 인코딩은 여기서 한 번만 하고 모든 세션/재실행이 같이 쓴다.
+# - 재실행마다 하는 일은 os.stat 한 번 ((mtime, size)가 같으면 그대로)
+# - 파일이 바뀌면 다시 읽고, 내용(sha1)까지 같으면 인코딩한 값도 그대로 쓴다
+# - base64는 실제로 화면에 쓰는 파일만 처음 필요할 때 만든다
+# 정적 주소: 컴포넌트 폴더(chart_overlay_frontend/assets)에 "chart.<내용 해시>.svg"로 복사해 두면
+# Streamlit이 앱과 같은 주소(같은 https/포트)에서 image/svg+xml로 보내 준다.
+# 내용이 바뀌면 이름이 바뀌므로 브라우저는 이미지를 한 번만 받는다.
+# (Streamlit 자체 static 폴더는 .svg를 text/plain으로 보내서 이미지로 쓸 수 없다)
+# 복사할 수 없거나 (읽기 전용 폴더 등) 화면이 이미지를 받지 못하면 예전처럼 base64 data URI로 넣는다.
+
+
+class SvgAsset:
+    def __init__(self, path, signature, data):
+        self.path = path
+        self.signature = signature
+        self.data = data
+        self.digest = hashlib.sha1(data).hexdigest()
+        self._base64 = None
+
+    @property
+    def name(self):
+        # 주소에 쓰는 이름: chart.1a2b3c4d5e6f.svg
+        base, ext = os.path.splitext(os.path.basename(self.path))
+        return f"{base}.{self.digest[:12]}{ext}"
+
+    @property
+    def base64(self):
+        if self._base64 is None:
+            self._base64 = base64.b64encode(self.data).decode("ascii")
+        return self._base64
+
+
+_assets = {}
+_lock = threading.Lock()
+
+
+def load_asset(path):
+    # 없는 파일이면 FileNotFoundError
+    st = os.stat(path)
+    signature = (st.st_mtime_ns, st.st_size)
+    with _lock:
+        asset = _assets.get(path)
+        if asset is not None and asset.signature == signature:
+            return asset
+    with open(path, "rb") as f:
+        data = f.read()
+    new = SvgAsset(path, signature, data)
+    with _lock:
+        if asset is not None and asset.digest == new.digest:
+            # 수정 시간만 바뀐 경우: 인코딩해 둔 값 재사용
+            new._base64 = asset._base64
+        _assets[path] = new
+    return new
+
+
+def svg_base64(path):
+    return load_asset(path).base64
+
+
+def missing_assets(paths):
+    return [p for p in paths if not os.path.exists(p)]
+
+
+_published = set()  # 복사해 둔 (폴더, 이름) (예전 버전 파일도 지우지 않아 열려 있는 화면이 깨지지 않게)
+_publish_failed = set()  # 복사할 수 없었던 폴더 (다시 시도하지 않는다)
+
+
+def publish_asset(path, folder):
+    # folder에 내용 해시 이름으로 복사하고 그 이름을 돌려준다 (복사할 수 없으면 None)
+    asset = load_asset(path)
+    with _lock:
+        if (folder, asset.name) in _published:
+            return asset.name
+        if folder in _publish_failed:
+            return None
+    target = os.path.join(folder, asset.name)
+    try:
+        if not os.path.exists(target):
+            os.makedirs(folder, exist_ok=True)
+            write_atomic(target, asset.data)
+    except OSError as e:
+        print(f"SVG를 {folder}에 복사할 수 없어 base64로 넣습니다: {e}")
+        with _lock:
+            _publish_failed.add(folder)
+        return None
+    with _lock:
+        _published.add((folder, asset.name))
+    return asset.name
+
+
+def asset_src(path, folder, url_prefix, inline=False):
+    # 차트 오버레이 컴포넌트에 보낼 배경 이미지 {"src": 주소 또는 base64 data URI}
+    # url_prefix: folder를 화면에서 부르는 상대 주소 ("assets/")
+    if not inline:
+        name = publish_asset(path, folder)
+        if name is not None:
+            return {"src": url_prefix + name}
+    return {"src": f"data:image/svg+xml;base64,{svg_base64(path)}"}
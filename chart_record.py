@@ -0,0 +1,171 @@
+from array import array
+
+# 차트 한 장을 담는 고정 슬롯 객체 (ChartRecord)와
+# 여러 장을 열(column)마다 array로 담는 ChartTable
+# JSON 경로 순서는 저장할 때 만드는 dict 순서와 같다.
+
+# (슬롯 이름, JSON 경로) - 앞의 18개가 차트 위 입력칸(field0 ~ field17) 순서
+OVERLAY_PATHS = [
+    ("middle_size", ("중지", "사이즈")),
+    ("middle_left", ("중지", "피치", "left")),
+    ("middle_reverse", ("중지", "피치", "reverse")),
+    ("middle_forward", ("중지", "피치", "forward")),
+    ("ring_size", ("약지", "사이즈")),
+    ("ring_right", ("약지", "피치", "right")),
+    ("ring_reverse", ("약지", "피치", "reverse")),
+    ("ring_forward", ("약지", "피치", "forward")),
+    ("span_middle", ("스팬", "중지")),
+    ("span_ring", ("스팬", "약지")),
+    ("thumb_size", ("엄지", "사이즈")),
+    ("thumb_left", ("엄지", "피치", "left")),
+    ("thumb_right", ("엄지", "피치", "right")),
+    ("thumb_reverse", ("엄지", "피치", "reverse")),
+    ("thumb_forward", ("엄지", "피치", "forward")),
+    ("cut_middle_ring", ("CUT", "중약지")),
+    ("cut_thumb", ("CUT", "엄지")),
+    ("bridge", ("브릿지",)),
+]
+OVERLAY_SLOTS = tuple(name for name, _ in OVERLAY_PATHS)
+
+_OTHER_PATHS = {
+    "name": ("이름",),
+    "cid": ("전화번호뒷자리",),
+    "pap_x": ("PAP", "수평"),
+    "pap_y": ("PAP", "수직"),
+    "layout": ("레이아웃",),
+    "tilt": ("틸트",),
+    "rotation": ("로테이션",),
+    "memo": ("메모",),
+    "toggle": ("토글상태",),
+    "hand": ("hand",),
+    "grip": ("grip",),
+}
+_overlay = dict(OVERLAY_PATHS)
+
+# 저장 dict와 같은 순서
+RECORD_PATHS = [(n, _OTHER_PATHS[n]) for n in ("name", "cid")]
+RECORD_PATHS += [(n, _overlay[n]) for n in OVERLAY_SLOTS[:15]]
+RECORD_PATHS += [(n, _OTHER_PATHS[n]) for n in ("pap_x", "pap_y", "layout", "tilt", "rotation", "memo")]
+RECORD_PATHS += [(n, _overlay[n]) for n in OVERLAY_SLOTS[15:]]
+RECORD_PATHS += [(n, _OTHER_PATHS[n]) for n in ("toggle", "hand", "grip")]
+RECORD_SLOTS = tuple(name for name, _ in RECORD_PATHS)
+_SLOT_BY_PATH = {path: name for name, path in RECORD_PATHS}
+
+
+def _walk(data, prefix=()):
+    for k, v in data.items():
+        path = prefix + (k,)
+        if isinstance(v, dict) and v:
+            yield from _walk(v, path)
+        else:
+            yield path, v
+
+
+def _put(data, path, value):
+    node = data
+    for part in path[:-1]:
+        node = node.setdefault(part, {})
+    node[path[-1]] = value
+
+
+class ChartRecord:
+    # 없는 칸은 None, 스키마에 없는 값(구버전 키 등)은 extra에 경로째 보관
+    __slots__ = RECORD_SLOTS + ("extra",)
+
+    def __init__(self, **values):
+        for name in RECORD_SLOTS:
+            setattr(self, name, values.get(name))
+        self.extra = values.get("extra")
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        extra = None
+        for path, value in _walk(data):
+            name = _SLOT_BY_PATH.get(path)
+            if name is not None and value is not None:
+                setattr(record, name, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[path] = value
+        record.extra = extra
+        return record
+
+    def to_dict(self):
+        data = {}
+        for name, path in RECORD_PATHS:
+            value = getattr(self, name)
+            if value is not None:
+                _put(data, path, value)
+        if self.extra:
+            for path, value in self.extra.items():
+                _put(data, path, value)
+        return data
+
+    @property
+    def fields(self):
+        # 입력칸 18개 값 (없는 칸은 "")
+        return [getattr(self, name) or "" for name in OVERLAY_SLOTS]
+
+    @property
+    def key(self):
+        return f"{self.name}_{self.cid}"
+
+    def __eq__(self, other):
+        if not isinstance(other, ChartRecord):
+            return NotImplemented
+        return all(getattr(self, n) == getattr(other, n) for n in self.__slots__)
+
+    def __repr__(self):
+        return f"ChartRecord({self.key!r})"
+
+
+class ChartTable:
+    # 열마다 array('I')에 문자열 번호만 저장 (같은 값은 한 번만 보관)
+    # 차트 10만 장을 메모리에 올려 검색/통계에 쓸 때 dict 묶음보다 훨씬 작다
+    def __init__(self, records=()):
+        self._values = [None]           # 번호 -> 값 (0은 None)
+        self._codes = {(type(None), None): 0}
+        self._columns = {name: array("I") for name in RECORD_SLOTS}
+        self._extra = {}                # 행 번호 -> extra (있는 행만)
+        for record in records:
+            self.append(record)
+
+    def _code(self, value):
+        k = (type(value), value)
+        code = self._codes.get(k)
+        if code is None:
+            code = self._codes[k] = len(self._values)
+            self._values.append(value)
+        return code
+
+    def append(self, record):
+        if isinstance(record, dict):
+            record = ChartRecord.from_dict(record)
+        row = len(self)
+        for name in RECORD_SLOTS:
+            self._columns[name].append(self._code(getattr(record, name)))
+        if record.extra:
+            self._extra[row] = record.extra
+        return row
+
+    def __len__(self):
+        return len(self._columns["name"])
+
+    def record(self, row):
+        values = {name: self._values[col[row]] for name, col in self._columns.items()}
+        return ChartRecord(extra=self._extra.get(row), **values)
+
+    def __iter__(self):
+        return (self.record(row) for row in range(len(self)))
+
+    def column(self, name):
+        return [self._values[c] for c in self._columns[name]]
+
+    def codes(self, name):
+        # 일괄 처리용: 값 번호 배열 그대로 (값은 value_of로)
+        return self._columns[name]
+
+    def value_of(self, code):
+        return self._values[code]
@@ -0,0 +1,67 @@
+import re
+
+from chart_derived import DERIVED_KEY, compute, derived_inputs
+
+# 차트 JSON 스키마 버전
+# 1 (schema_version 없음): 예전 파일
+#   - PAP가 "X - Y" 문자열
+#   - 그립이 "grip" 대신 "그립방식"
+#   - "토글상태" / "hand" 가 없을 수 있음
+# 2: "schema_version": 2
+# 3: 지금 저장하는 형식 - 변환 결과 "변환값" (chart_derived.py) 추가
+
+SCHEMA_VERSION = 3
+
+# 예전 PAP 문자열 ("1 1/4 - 3/8", 수직은 음수 가능)
+PAP_PATTERN = re.compile(r"([\d\s/\.]+)\s*-\s*(-?[\d\s/\.]+)")
+
+
+def schema_version(data):
+    return data.get("schema_version", 1)
+
+
+def _upgrade_v1(data):
+    pap = data.get("PAP", {})
+    if isinstance(pap, str):
+        match = PAP_PATTERN.match(pap)
+        if match:
+            pap = {"수평": match.group(1).strip(), "수직": match.group(2).strip()}
+        else:
+            pap = {"수평": "", "수직": ""}
+    elif not isinstance(pap, dict):
+        pap = {"수평": "", "수직": ""}
+    data["PAP"] = pap
+    grip = data.pop("그립방식", "클래식")
+    data.setdefault("grip", grip)
+    data.setdefault("토글상태", False)
+    data.setdefault("hand", "오른손")
+
+
+def _upgrade_v2(data):
+    data[DERIVED_KEY] = compute(derived_inputs(data))
+
+
+UPGRADES = {
+    1: _upgrade_v1,
+    2: _upgrade_v2,
+}
+
+
+def upgrade(data):
+    # (최신 버전 dict, 바뀌었는지) - 원본은 캐시에서 공유될 수 있으므로 복사본을 고친다
+    version = schema_version(data)
+    if version >= SCHEMA_VERSION:
+        return data, False
+    data = dict(data)
+    while version < SCHEMA_VERSION:
+        UPGRADES[version](data)
+        version += 1
+    data["schema_version"] = SCHEMA_VERSION
+    return data, True
+
+
+def stamp(data):
+    # 저장할 dict에 현재 버전 표시
+    if data.get("schema_version") == SCHEMA_VERSION:
+        return data
+    return dict(data, schema_version=SCHEMA_VERSION)
@@ -0,0 +1,107 @@
+import argparse
+import os
+import time
+
+from chart_store import chart_file_key, file_signature, iter_chart_files
+from compression import CODECS, codec_of, compress_bytes, decompress_file_bytes
+from atomic_write import write_atomic
+
+# 오래 수정하지 않은 차트 압축
+# 사용법: python cold_storage.py [--data data] [--tiers 180:gzip,730:xz] [--dry-run]
+# - tiers: "며칠 이상 지난 파일:코덱" 목록, 나이가 많을수록 뒤쪽(더 강한) 코덱
+#   (zstandard가 설치되어 있으면 기본 첫 단계는 zstd)
+# - 수정 시간은 그대로 유지하므로 최근 목록/나이 계산이 바뀌지 않는다
+# - 다시 저장하면 압축 없는 .json으로 돌아가고 압축본은 지워진다
+# - 압축하는 동안 앱에서 저장된 파일은 건드리지 않고 만든 압축본을 버린다 (changed)
+
+DEFAULT_TIERS = [(180, "zstd" if "zstd" in CODECS else "gzip"), (730, "xz")]
+
+
+def parse_tiers(text):
+    tiers = []
+    for part in text.split(","):
+        days, codec = part.split(":")
+        if codec not in CODECS:
+            raise ValueError(f"사용할 수 없는 코덱: {codec}")
+        tiers.append((float(days), codec))
+    return sorted(tiers)
+
+
+def target_codec(age_days, tiers):
+    codec = None
+    for days, name in tiers:
+        if age_days >= days:
+            codec = name
+    return codec
+
+
+def _remove_source(path, signature):
+    # 압축 전 파일 지우기: 먼저 옆 이름으로 옮기고(rename) 옮긴 파일이 읽은 파일 그대로인지 다시 확인
+    # (확인과 삭제 사이에 저장되면 새 저장본을 지우게 되므로). 그 사이 저장된 파일이면 되돌려 놓고 False
+    aside = f"{path}.{os.getpid()}.cold"
+    try:
+        os.rename(path, aside)
+    except OSError:
+        return False
+    if file_signature(os.stat(aside)) == signature:
+        os.remove(aside)
+        return True
+    try:
+        os.link(aside, path)  # 그 뒤에 또 저장되었으면 그 파일을 그대로 둔다 (덮어쓰지 않음)
+    except FileExistsError:
+        pass
+    os.remove(aside)
+    return False
+
+
+def compress_cold(folder="data", tiers=DEFAULT_TIERS, dry_run=False, now=None):
+    now = now or time.time()
+    tier_order = [name for _, name in tiers]
+    report = {"files": 0, "bytes_before": 0, "bytes_after": 0, "changed": 0}
+    for path in iter_chart_files(folder):
+        st = os.stat(path)
+        target = target_codec((now - st.st_mtime) / 86400, tiers)
+        current = codec_of(path)
+        if target is None or current == target:
+            continue
+        if current in tier_order and tier_order.index(current) > tier_order.index(target):
+            continue  # 이미 더 강하게 압축됨
+        with open(path, "rb") as f:
+            raw = decompress_file_bytes(path, f.read())
+            signature = file_signature(os.fstat(f.fileno()))
+        suffix, packed = compress_bytes(target, raw)
+        base = os.path.join(os.path.dirname(path), chart_file_key(os.path.basename(path)) + ".json")
+        if not dry_run:
+            new_path = base + suffix
+            write_atomic(new_path, packed)
+            # 읽은 뒤 새로 저장되었으면 저장본을 두고 압축본을 지운다
+            # (저장하면 원본이 바뀌거나, 압축 파일들이 지워진다)
+            try:
+                os.utime(new_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+                unchanged = file_signature(os.stat(path)) == signature
+            except FileNotFoundError:
+                unchanged = False
+            if unchanged:
+                # 옮겨 둔 사이에 저장되면 압축본이 지워지고 새 .json이 남는다
+                unchanged = _remove_source(path, signature) and os.path.exists(new_path)
+            if not unchanged:
+                if os.path.exists(new_path):
+                    os.remove(new_path)
+                report["changed"] += 1
+                continue
+        report["files"] += 1
+        report["bytes_before"] += st.st_size
+        report["bytes_after"] += len(packed)
+    report["bytes_saved"] = report["bytes_before"] - report["bytes_after"]
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="오래된 차트 파일 압축")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--tiers", default=",".join(f"{d:g}:{c}" for d, c in DEFAULT_TIERS))
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    result = compress_cold(args.data, parse_tiers(args.tiers), args.dry_run)
+    print(f"압축 {result['files']}개: {result['bytes_before']} -> {result['bytes_after']} bytes "
+          f"({result['bytes_saved']} bytes 절약, 압축 중 저장되어 건너뜀 {result['changed']}개)")
@@ -0,0 +1,49 @@
+import gzip
+import lzma
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# 차트 파일 압축 코덱 (파일 확장자로 구분: 신현감_8781.json.gz 등)
+# zstd는 zstandard 패키지가 있을 때만 사용
+
+
+def _zstd_compress(raw):
+    return zstandard.ZstdCompressor(level=10).compress(raw)
+
+
+def _zstd_decompress(raw):
+    return zstandard.ZstdDecompressor().decompress(raw)
+
+
+CODECS = {
+    "gzip": (".gz", lambda raw: gzip.compress(raw, 9), gzip.decompress),
+    "xz": (".xz", lambda raw: lzma.compress(raw, preset=9), lzma.decompress),
+}
+if zstandard is not None:
+    CODECS["zstd"] = (".zst", _zstd_compress, _zstd_decompress)
+
+# 압축 없는 파일("")을 맨 앞에 (저장은 항상 압축 없이 하므로 가장 흔함)
+FILE_SUFFIXES = ("",) + tuple(suffix for suffix, _, _ in CODECS.values())
+_BY_SUFFIX = {suffix: (name, dec) for name, (suffix, _, dec) in CODECS.items()}
+
+
+def codec_of(path):
+    for suffix, (name, _) in _BY_SUFFIX.items():
+        if path.endswith(suffix):
+            return name
+    return None
+
+
+def decompress_file_bytes(path, raw):
+    for suffix, (_, dec) in _BY_SUFFIX.items():
+        if path.endswith(suffix):
+            return dec(raw)
+    return raw
+
+
+def compress_bytes(codec, raw):
+    suffix, comp, _ = CODECS[codec]
+    return suffix, comp(raw)
@@ -0,0 +1,145 @@
+import os
+import re
+from functools import lru_cache
+
+# 측정값 문자열 해석 (app.py, chart_widget.py, batch_convert.py 공용)
+# - inch: 정수 "1", 소수 "1.5", 분수 "3/8", 혼합분수 "1 1/4" (앞에 "+"/"-" 가능)
+#   부호는 예전 convert_fraction(int/float 변환)과 같게 붙인다: 혼합분수는 정수 부분에만 ("-1 1/4" = -1 + 1/4)
+# - mm: "12.70 mm" (이미 변환된 값)
+# - 엄지홀 오블롱: "63>61" 또는 "63>61))..." (앞뒤 값은 64분할, 뒤의 "))..."는 바벨 표시)
+# 입력은 대부분 같은 몇백 개 문자열이 반복되므로 결과를 크기가 정해진 캐시에 보관한다.
+
+INCH_TO_MM = 25.4
+OBLONG_FACTOR = 0.7071  # 45도 오블롱 (cos 45)
+MEMO_SIZE = int(os.environ.get("CHART_PARSE_CACHE", 4096))
+
+# 칸별 해석 결과
+OK = 0          # inch 값을 mm로 변환함
+EMPTY = 1       # 빈 칸
+ALREADY_MM = 2  # 이미 mm 값 ("12.70 mm")
+INVALID = 3     # 해석할 수 없는 값
+STATUS_NAMES = ("ok", "empty", "already_mm", "invalid")
+
+_MEASURE = re.compile(r"""
+    \s*(?P<sign>[+-])?
+    (?:
+        (?P<whole>\d+)\s+(?P<num>\d+)/(?P<den>\d+)   # 1 1/4
+      | (?P<fnum>\d+)/(?P<fden>\d+)                  # 3/8
+      | (?P<dec>\d+\.?\d*|\.\d+)\s*(?P<mm>mm)?      # 1, 1.5, .5, 12.70 mm
+    )
+    \s*
+""", re.X | re.I)
+
+# ">" 앞뒤는 정수만 (소수면 이미 변환된 값), "))" 뒤에는 ">"나 또 다른 "))"가 없어야 한다
+_OBLONG = re.compile(r"(?P<base>\s*\d+\s*)>(?P<after>\s*\d+\s*)(?P<barbell>\)\)(?:(?!\)\))[^>])*)?", re.S)
+_NUMBER = re.compile(r"[\d.]+")
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def parse_measure(text):
+    # (숫자, 상태) - 상태가 OK면 inch 값, ALREADY_MM이면 mm 값
+    # 분수가 아닌 숫자는 단위 없이도 mm_value로 읽을 수 있다
+    m = _MEASURE.fullmatch(text)
+    if m is None:
+        return None, (EMPTY if not text.strip() else INVALID)
+    sign = m["sign"] or ""
+    if m["dec"] is not None:
+        value = float(sign + m["dec"])
+    else:
+        den = int(m["den"] or m["fden"])
+        if den == 0:
+            return None, INVALID
+        if m["whole"] is not None:
+            value = int(sign + m["whole"]) + int(m["num"]) / den
+        else:
+            value = int(sign + m["fnum"]) / den
+    return value, (ALREADY_MM if m["mm"] else OK)
+
+
+def parse_pitch(text):
+    # (mm 값, 상태) - 이미 mm인 값은 그 숫자를 그대로, 나머지는 0
+    value, status = parse_measure(text)
+    if status == OK:
+        return round(value * INCH_TO_MM, 2), OK
+    return (value if status == ALREADY_MM else 0.0), status
+
+
+def mm_value(text):
+    # 좌표 계산용 mm 숫자 ("12.70 mm" 또는 단위 없는 숫자, 분수나 해석 불가면 0)
+    value, status = parse_measure(text)
+    if status == ALREADY_MM or (status == OK and "/" not in text):
+        return value
+    return 0.0
+
+
+def format_mm(mm):
+    return f"{mm:.2f} mm"
+
+
+def _to_64(value):
+    # 64분할 값으로 (33~95 범위가 되도록 2, 4, 8, 16배)
+    for f in (1, 2, 4, 8, 16):
+        if 33 <= value * f < 96:
+            return value * f
+    return None
+
+
+def _build_oblong_table():
+    # (앞 값, 뒤 값) -> 이동량 mm, 변환할 수 있는 모든 조합 (3~95 x 3~95)
+    # 계산식은 예전 parse_thumb_oblong_strict와 같으므로 결과도 같다
+    to_64 = {v: _to_64(v) for v in range(OBLONG_MAX + 1)}
+    table = {}
+    for before, before_64 in to_64.items():
+        for after, after_64 in to_64.items():
+            if before_64 is not None and after_64 is not None:
+                move = (abs(after_64 - before_64) / 2) / 64  # inch (64분할 값 차이의 절반)
+                table[(before, after)] = round(move * INCH_TO_MM * OBLONG_FACTOR, 2)
+    return table
+
+
+OBLONG_MAX = 95
+OBLONG_TABLE = _build_oblong_table()
+_OBLONG_TEXT = {pair: f"{mm:.2f}" for pair, mm in OBLONG_TABLE.items()}
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def oblong_pair(text):
+    # "63>61))..." -> (63, 61) (오블롱 표기가 아니면 None)
+    m = _OBLONG.fullmatch(text)
+    if m is None:
+        return None
+    return int(m["base"]), int(m["after"])
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def convert_oblong(text):
+    # "63>61))..." -> "63>0.28))..." (45도 이동량 mm, 변환할 수 없으면 그대로)
+    m = _OBLONG.fullmatch(text)
+    if m is None:
+        return text
+    mm = _OBLONG_TEXT.get((int(m["base"]), int(m["after"])))
+    if mm is None:
+        return text
+    return f"{m['base']}>{mm}{m['barbell'] or ''}"
+
+
+def oblong_mm(text):
+    # (변환된) 엄지홀 값의 ">" 뒤 첫 숫자 (없으면 0)
+    if ">" not in text:
+        return 0.0
+    found = _NUMBER.findall(text.split(">")[1])
+    try:
+        return float(found[0]) if found else 0.0
+    except ValueError:
+        return 0.0
+
+
+@lru_cache(maxsize=MEMO_SIZE)
+def thumb_mm(text):
+    # 엄지홀 값을 변환했을 때의 이동량 mm
+    mm = OBLONG_TABLE.get(oblong_pair(text.strip()))
+    return mm if mm is not None else oblong_mm(text)
+
+
+def cache_info():
+    return {f.__name__: f.cache_info()._asdict() for f in (parse_measure, oblong_pair, convert_oblong, thumb_mm)}
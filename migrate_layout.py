@@ -0,0 +1,68 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from chart_store import DirChartStore, LAYOUT_FILENAME, is_shard_dir, chart_file_key
+from atomic_write import fsync_dir
+
+# data 폴더를 해시 샤딩 구조(data/ab/cd/{key}.json)로 옮기는 도구
+# 사용법: python migrate_layout.py [--data data] [--workers 8] [--dry-run]
+# - 파일마다 os.replace로 옮기므로 중간에 멈춰도 다시 실행하면 남은 파일만 옮긴다
+# - 이미 새 위치에 파일이 있으면 (옮긴 뒤 다시 저장된 경우) 예전 파일만 지운다
+# - 모두 끝나면 data/.layout 에 "sharded"를 써서 이후 저장/불러오기가 새 위치를 쓰게 한다
+# - 옮기는 동안에도 앱은 두 위치를 모두 확인하므로 계속 사용할 수 있다
+
+
+def move_one(store, filename, dry_run):
+    # 압축된 파일(.json.gz 등)도 확장자 그대로 옮긴다
+    key = chart_file_key(filename)
+    src = os.path.join(store.folder, filename)
+    dst = os.path.join(os.path.dirname(store.shard_path(key)), filename)
+    if dry_run:
+        return "move"
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.exists(dst) and os.path.getmtime(dst) >= os.path.getmtime(src):
+        os.remove(src)
+        return "skip"
+    os.replace(src, dst)
+    return "move"
+
+
+def migrate(folder="data", workers=8, dry_run=False):
+    store = DirChartStore(folder)
+    files = [f for f in os.listdir(folder) if chart_file_key(f) is not None]
+    print(f"옮길 파일: {len(files)}개")
+    counts = {"move": 0, "skip": 0, "error": 0}
+    start = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {f: pool.submit(move_one, store, f, dry_run) for f in files}
+        for i, (key, future) in enumerate(futures.items(), 1):
+            try:
+                counts[future.result()] += 1
+            except Exception as e:
+                counts["error"] += 1
+                print(f"실패: {key} ({e})")
+            if i % 1000 == 0:
+                print(f"  {i}/{len(files)} ({time.time() - start:.1f}초)")
+    print(f"완료: 이동 {counts['move']}, 중복 정리 {counts['skip']}, 실패 {counts['error']}")
+    if dry_run or counts["error"]:
+        return counts
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if is_shard_dir(name) and os.path.isdir(path):
+            for sub in os.listdir(path):
+                fsync_dir(os.path.join(path, sub))
+    with open(os.path.join(folder, LAYOUT_FILENAME), "w", encoding="utf-8") as f:
+        f.write("sharded")
+    fsync_dir(folder)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="data 폴더를 해시 샤딩 구조로 옮기기")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    migrate(args.data, args.workers, args.dry_run)
@@ -0,0 +1,114 @@
+import os
+
+import numpy as np
+
+from chart_derived import PITCH_INDICES, COORD_INDICES, derived_inputs
+from chart_schema import upgrade
+from chart_store import iter_chart_files, read_chart_file, chart_file_key
+from measurement import (OK, EMPTY, ALREADY_MM, STATUS_NAMES, INCH_TO_MM, OBLONG_MAX, OBLONG_TABLE,
+                         parse_measure, oblong_pair, oblong_mm)
+
+# 여러 차트의 피치 값을 한 번에 inch -> mm 변환 (시즌 전 전체 고객 mm/좌표표 만들기용)
+# - 문자열 해석은 서로 다른 문자열마다 한 번만 하고 (대부분 같은 몇백 개 값이 반복된다)
+# - mm 변환과 좌표 계산은 NumPy 배열로 전체를 한 번에 한다
+# 문자열 해석은 measurement.py (화면의 "변환" 버튼과 같은 규칙)
+# 열 순서는 chart_derived.PITCH_INDICES
+
+
+def _factorize(strings):
+    # 서로 다른 문자열 목록과 각 원소의 번호 배열
+    codes = {}
+    index = np.fromiter((codes.setdefault(s, len(codes)) for s in strings), dtype=np.intp, count=len(strings))
+    return list(codes), index
+
+
+def round_mm(mm):
+    # np.round(mm, 2) - 단, x.xx5 근처 값은 화면(parse_pitch의 round)과 같게
+    # np.round는 100을 곱한 뒤 반올림해서 1/8 inch (3.175 mm, 실제 저장값은 3.17499...)를 3.18로 만든다.
+    # 그런 값만 골라 round로 다시 계산한다 (서로 다른 값 몇 개뿐)
+    rounded = np.round(mm, 2)
+    scaled = mm * 100
+    tie = np.flatnonzero(np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+    rounded[tie] = [round(v, 2) for v in mm[tie].tolist()]
+    return rounded
+
+
+def parse_column(strings):
+    # 문자열 배열 -> (mm 배열, 상태 배열) (measurement.parse_pitch와 같은 결과)
+    # 서로 다른 문자열만 (숫자, 상태)로 해석하고, inch -> mm 변환과 반올림은 배열로 한 번에
+    strings = np.asarray(strings, dtype=object)
+    unique, inverse = _factorize(strings.ravel().tolist())
+    parsed = [parse_measure(s) for s in unique]
+    value = np.array([v if v is not None else 0.0 for v, _ in parsed] or [0.0], dtype=np.float64)
+    status = np.array([st for _, st in parsed] or [EMPTY], dtype=np.int8)
+    # OK는 inch 값, ALREADY_MM은 이미 mm 값, 나머지는 0
+    mm = np.where(status == OK, round_mm(value * INCH_TO_MM), np.where(status == ALREADY_MM, value, 0.0))
+    return mm[inverse].reshape(strings.shape), status[inverse].reshape(strings.shape)
+
+
+# 엄지 오블롱 (앞 값, 뒤 값) -> mm 표 (변환할 수 없는 조합은 nan)
+_OBLONG_GRID = np.full((OBLONG_MAX + 1, OBLONG_MAX + 1), np.nan)
+for (_before, _after), _mm in OBLONG_TABLE.items():
+    _OBLONG_GRID[_before, _after] = _mm
+
+
+def oblong_pairs_mm(before, after):
+    # 정수 배열 두 개 -> 이동량 mm 배열 (범위 밖이거나 변환할 수 없으면 nan)
+    before = np.asarray(before, dtype=np.int64)
+    after = np.asarray(after, dtype=np.int64)
+    inside = (before >= 0) & (before <= OBLONG_MAX) & (after >= 0) & (after <= OBLONG_MAX)
+    mm = np.full(before.shape, np.nan)
+    mm[inside] = _OBLONG_GRID[before[inside], after[inside]]
+    return mm
+
+
+def thumb_column(strings):
+    # 엄지홀 문자열 배열 -> 이동량 mm 배열 (measurement.thumb_mm과 같은 결과)
+    unique, inverse = _factorize(list(strings))
+    pairs = np.array([oblong_pair(s.strip()) or (-1, -1) for s in unique], dtype=np.int64).reshape(-1, 2)
+    mm = oblong_pairs_mm(pairs[:, 0], pairs[:, 1])
+    # 표에 없는 값 (이미 변환된 "63>0.28" 등)은 ">" 뒤 숫자
+    missing = np.flatnonzero(np.isnan(mm))
+    mm[missing] = [oblong_mm(unique[i]) for i in missing]
+    return mm[inverse]
+
+
+def coordinates(mm, status, thumb_mm, left_hand):
+    # (n, 4) 배열: fx, fy, sx, sy (변환 안 된 칸은 0으로 계산)
+    usable = (status == OK) | (status == ALREADY_MM)
+    cols = [PITCH_INDICES.index(i) for i in COORD_INDICES]
+    left, right, reverse, forward = (np.where(usable[:, c], mm[:, c], 0.0) for c in cols)
+    # 왼손은 엄지 이동 방향이 반대
+    sign = np.where(left_hand, -1.0, 1.0)
+    dx = right - left
+    dy = forward - reverse
+    return np.column_stack((dx - thumb_mm, dy + sign * thumb_mm, dx + thumb_mm, dy - sign * thumb_mm))
+
+
+def convert_charts(charts):
+    # charts: 차트 dict 목록
+    # 결과: {"mm": (n, 10), "status": (n, 10) int8, "thumb_mm": (n,), "coords": (n, 4)}
+    # mm/status의 열 순서는 PITCH_INDICES, coords는 fx, fy, sx, sy
+    inputs = [derived_inputs(c) for c in charts]
+    raw = np.array([row[:-2] for row in inputs], dtype=object).reshape(len(charts), len(PITCH_INDICES))
+    mm, status = parse_column(raw)
+    thumb_mm = thumb_column([row[-2] for row in inputs])
+    left_hand = np.array([row[-1] == "왼손" for row in inputs], dtype=bool)
+    return {
+        "mm": mm,
+        "status": status,
+        "thumb_mm": thumb_mm,
+        "coords": coordinates(mm, status, thumb_mm, left_hand),
+    }
+
+
+def convert_folder(folder="data"):
+    # 저장된 전체 차트 변환: (key 목록, convert_charts 결과)
+    # export_coordinates.py처럼 파일을 직접 읽어 최신 형식으로 바꾸기만 한다 (파일은 바꾸지 않음)
+    paths = sorted(iter_chart_files(folder), key=lambda p: chart_file_key(os.path.basename(p)))
+    keys = [chart_file_key(os.path.basename(p)) for p in paths]
+    return keys, convert_charts([upgrade(read_chart_file(p))[0] for p in paths])
+
+
+def status_counts(status):
+    return {name: int((status == code).sum()) for code, name in enumerate(STATUS_NAMES)}
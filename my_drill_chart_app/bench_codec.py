@@ -0,0 +1,123 @@
+import os
+import sys
+import timeit
+
+from chart_codec import decode, encode
+from chart_derived import materialize
+from chart_schema import stamp, upgrade
+from serializer import SERIALIZER, get_serializer
+from chart_store import iter_chart_files, read_chart_file
+
+# 차트 변환(chart_codec) 확인 + 속도 비교
+# 사용법: python bench_codec.py [data 폴더] [반복 횟수]
+# - 고정 확인: 정해 둔 입력(GOLDEN_FORM)을 저장하면 golden/chart_codec.json과 바이트까지 같은지
+#   (app.py와 chart_widget.py 모두 이 모양의 form을 encode -> save_data_as_json으로 저장한다.
+#    data 폴더에 무엇이 있든 같은 기준으로 확인하려고 pretty 직렬화로 고정)
+# - 확인: data 폴더의 모든 차트가 decode -> encode 후 같은 내용/같은 바이트로 저장되는지
+# - 속도: 예전 방식(.get() 연쇄)과 decode 비교 (번갈아 여러 번 재고 가장 빠른 값)
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "chart_codec.json")
+
+# 두 화면이 저장할 때 encode에 넘기는 값 (앞뒤 공백은 encode가 지우는 값/남기는 값 모두 포함)
+GOLDEN_FORM = {
+    "name": "홍길동",
+    "cid": "1234",
+    "fields": [
+        " 1 1/4", "1/4", "3/8", "1/8",
+        "1 1/4 ", "1/8", "1/4", "0",
+        "4 1/4", "4 3/8",
+        "31/32", "3/8", "1/4", "1/2", "1/16",
+        "1/8", "1/4", "1/4",
+    ],
+    "pap_x": "5 1/4",
+    "pap_y": " 1/2",
+    "layout": "45x4x60",
+    "tilt": "1/4",
+    "rotation": "10",
+    "memo": " 오일 패턴 긴 레인\n엄지 테이프 2장 ",
+    "toggle": True,
+    "hand": "왼손",
+    "grip": "클래식",
+}
+
+
+def golden_bytes(form):
+    # 저장 경로와 같은 순서 (save_data_as_json: materialize -> stamp -> 직렬화)
+    return get_serializer("pretty").dumps(stamp(materialize(encode(form))))
+
+
+def check_golden(write=False):
+    raw = golden_bytes(GOLDEN_FORM)
+    if write:
+        with open(GOLDEN_PATH, "wb") as f:
+            f.write(raw)
+    with open(GOLDEN_PATH, "rb") as f:
+        expected = f.read()
+    assert raw == expected, "저장 결과가 golden/chart_codec.json과 다름"
+    # 저장본을 다시 불러와 저장해도 같은 바이트
+    assert golden_bytes(decode(SERIALIZER.loads(expected))) == expected
+    print("고정 입력: golden/chart_codec.json과 바이트 일치")
+
+
+def per_call(fns, samples, repeat):
+    # 번갈아 재서 가장 빠른 값 (us/건)
+    best = {label: None for label, _ in fns}
+    for _ in range(7):
+        for label, fn in fns:
+            t = timeit.timeit(lambda: [fn(data) for data in samples], number=repeat) / (repeat * len(samples)) * 1e6
+            best[label] = t if best[label] is None else min(best[label], t)
+    return best
+
+
+def old_decode(data):
+    # app.py / chart_widget.py 에 있던 방식
+    fields = [
+        data.get("중지", {}).get("사이즈", ""),
+        data.get("중지", {}).get("피치", {}).get("left", ""),
+        data.get("중지", {}).get("피치", {}).get("reverse", ""),
+        data.get("중지", {}).get("피치", {}).get("forward", ""),
+        data.get("약지", {}).get("사이즈", ""),
+        data.get("약지", {}).get("피치", {}).get("right", ""),
+        data.get("약지", {}).get("피치", {}).get("reverse", ""),
+        data.get("약지", {}).get("피치", {}).get("forward", ""),
+        data.get("스팬", {}).get("중지", ""),
+        data.get("스팬", {}).get("약지", ""),
+        data.get("엄지", {}).get("사이즈", ""),
+        data.get("엄지", {}).get("피치", {}).get("left", ""),
+        data.get("엄지", {}).get("피치", {}).get("right", ""),
+        data.get("엄지", {}).get("피치", {}).get("reverse", ""),
+        data.get("엄지", {}).get("피치", {}).get("forward", ""),
+        data.get("CUT", {}).get("중약지", ""),
+        data.get("CUT", {}).get("엄지", ""),
+        data.get("브릿지", ""),
+    ]
+    pap = data.get("PAP", {})
+    return {
+        "name": data.get("이름", ""), "cid": data.get("전화번호뒷자리", ""), "fields": fields,
+        "pap_x": pap.get("수평", ""), "pap_y": pap.get("수직", ""),
+        "layout": data.get("레이아웃", ""), "tilt": data.get("틸트", ""),
+        "rotation": data.get("로테이션", ""), "memo": data.get("메모", ""),
+        "toggle": bool(data.get("토글상태", False)), "hand": data.get("hand", "오른손"),
+        "grip": data.get("grip", data.get("그립방식", "클래식")),
+    }
+
+
+def main():
+    folder = sys.argv[1] if len(sys.argv) > 1 else "data"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    check_golden()
+    samples = [upgrade(read_chart_file(path))[0] for path in iter_chart_files(folder)]
+    for data in samples:
+        form = decode(data)
+        assert form == old_decode(data), data.get("이름")
+        assert SERIALIZER.dumps(stamp(materialize(encode(form)))) == SERIALIZER.dumps(data), data.get("이름")
+    print(f"샘플 {len(samples)}개: decode/encode 결과 일치")
+
+    forms = [decode(data) for data in samples]
+    timings = per_call((("예전(.get)", old_decode), ("decode", decode)), samples, repeat)
+    timings.update(per_call((("encode", encode),), forms, repeat))
+    for label, us in timings.items():
+        print(f"{label:12} {us:8.2f} us/건")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import random
+import re
+import sys
+import time
+
+import measurement
+from measurement import OK, ALREADY_MM, INVALID, format_mm, parse_pitch, mm_value, convert_oblong, thumb_mm
+
+# 측정값 해석: 예전 함수들(app.py / chart_widget.py 에 있던 것)과 measurement.py 비교
+# 사용법: python bench_measurement.py [문자열 개수]
+# - 확인: 합성 입력 전체에서 변환 결과가 예전과 같은지 + 부호 있는 값은 정해 둔 결과(SIGNED)와도 비교
+# - 속도: 같은 입력을 예전 함수와 새 함수로 해석하는 시간 (새 함수는 캐시 포함)
+
+
+def old_convert_fraction(val_str):
+    if not val_str:
+        return None
+    s = val_str.strip().lower()
+    if "mm" in s:
+        return None
+    try:
+        if ' ' in s and '/' in s:
+            whole, frac = s.split()
+            num, den = frac.split('/')
+            return int(whole) + int(num) / int(den)
+        elif '/' in s:
+            num, den = s.split('/')
+            return int(num) / int(den)
+        else:
+            return float(s)
+    except Exception:
+        return None
+
+
+def old_get_mm(raw):
+    raw = raw.replace("mm", "").strip()
+    try:
+        return float(raw)
+    except Exception:
+        return 0.0
+
+
+def old_oblong(value):
+    try:
+        if ">" in value:
+            base, after = value.split(">")
+            if "))" in after:
+                after, after_barbell = after.split("))")
+                after_barbell = "))" + after_barbell
+            else:
+                after_barbell = ""
+            valid_range = range(33, 96)
+
+            def get_64_value(val_str):
+                if '.' in val_str:
+                    return None
+                val_int = int(val_str)
+                if val_int in valid_range:
+                    return val_int
+                for f in [2, 4, 8, 16]:
+                    candidate = val_int * f
+                    if candidate in valid_range:
+                        return candidate
+                return None
+            before_64 = get_64_value(base.strip())
+            after_64 = get_64_value(after.strip())
+            if before_64 is None or after_64 is None:
+                return value
+            diff = abs(after_64 - before_64)
+            move = (diff / 2) / 64
+            mm = round(move * 25.4 * 0.7071, 2)
+            return f"{base}>{mm:.2f}{after_barbell}"
+    except Exception:
+        pass
+    return value
+
+
+def old_thumb_mm(value):
+    thumb_raw = old_oblong(value.strip())
+    if ">" in thumb_raw:
+        try:
+            found = re.findall(r"[\d.]+", thumb_raw.split(">")[1])
+            if found:
+                return float(found[0])
+        except Exception:
+            pass
+    return 0.0
+
+
+# 부호 있는 값: (입력, parse_pitch 결과, mm_value 결과) - 예전 convert_fraction/get_mm과 같다
+# 혼합분수의 부호는 정수 부분에만 붙는다 ("-1 1/4" = -1 + 1/4 = -0.75 inch)
+SIGNED = [
+    ("-1 1/4", (-19.05, OK), 0.0),
+    ("+1", (25.4, OK), 1.0),
+    ("+1/2", (12.7, OK), 0.0),
+    ("+1 1/4", (31.75, OK), 0.0),
+    ("-1/8", (-3.17, OK), 0.0),
+    ("-0.5", (-12.7, OK), -0.5),
+    ("+12.70 mm", (12.7, ALREADY_MM), 12.7),
+    ("-12.70 mm", (-12.7, ALREADY_MM), -12.7),
+    ("- 1/4", (0.0, INVALID), 0.0),
+]
+
+
+def corpus(n, seed=1):
+    # 실제 입력처럼 몇백 개 문자열이 반복되고 가끔 잘못된 값이 섞인 목록
+    rng = random.Random(seed)
+    pitches = [f"{n}/{d}" for d in (2, 4, 8, 16, 32) for n in range(1, d)]
+    pitches += [f"{w} {n}/{d}" for w in (1, 2) for d in (4, 8, 16) for n in range(1, d, 2)]
+    pitches += ["0", "1", "2", "0.5", "1.25", "", "12.70 mm", "3.18mm", "x", "1/0", "1/4 mm", "-1/8"]
+    pitches += [text for text, _, _ in SIGNED] + ["-0", "-0/4", "-0 1/4", "+0.5"]
+    thumbs = [f"{a}>{b}" for a in range(55, 70) for b in range(55, 70)]
+    thumbs += [t + "))2" for t in thumbs[:40]] + ["", "63", "63>0.28", "63>61>2", "63>61))2))3", "x>61"]
+    return [rng.choice(pitches) for _ in range(n)], [rng.choice(thumbs) for _ in range(n // 4)]
+
+
+def timed(fn, items):
+    start = time.perf_counter()
+    for s in items:
+        fn(s)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    pitches, thumbs = corpus(n)
+    for s, pitch, mm in SIGNED:
+        assert parse_pitch(s) == pitch and mm_value(s) == mm, s
+    for s in set(pitches):
+        old = old_convert_fraction(s)
+        mm, status = parse_pitch(s)
+        assert (old is None) == (status != OK), s
+        assert old is None or format_mm(round(old * 25.4, 2)) == format_mm(mm), s
+        assert old_get_mm(s) == mm_value(s), s
+    for s in set(thumbs):
+        assert old_oblong(s) == convert_oblong(s), s
+        assert old_thumb_mm(s) == thumb_mm(s), s
+    print(f"피치 {len(pitches)}개 (서로 다른 값 {len(set(pitches))}), 엄지 {len(thumbs)}개: 결과 일치")
+
+    rows = [
+        ("피치 mm", lambda s: old_convert_fraction(s) is not None and round(old_convert_fraction(s) * 25.4, 2),
+         parse_pitch, pitches),
+        ("좌표 mm", old_get_mm, mm_value, pitches),
+        ("엄지 오블롱", old_thumb_mm, thumb_mm, thumbs),
+    ]
+    print(f"{'':12} {'예전(us/건)':>12} {'새(us/건)':>12}")
+    for label, old_fn, new_fn, items in rows:
+        print(f"{label:12} {timed(old_fn, items):12.3f} {timed(new_fn, items):12.3f}")
+    print(measurement.cache_info())
+
+
+if __name__ == "__main__":
+    main()
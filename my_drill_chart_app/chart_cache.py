@@ -0,0 +1,78 @@
+import os
+import threading
+from collections import OrderedDict
+
+# 파싱된 차트 캐시 (프로세스 전체 공유)
+# Streamlit은 세션마다 스크립트를 다시 실행하지만 모듈은 한 번만 import 되므로
+# 여기 만든 CHART_CACHE 하나를 모든 세션이 같이 쓴다.
+# 파일 경로로 찾고, (mtime, size)가 바뀌었으면 다시 읽는다.
+# 반환된 dict는 여러 세션이 공유하므로 수정하지 말 것.
+
+
+class ChartCache:
+    def __init__(self, max_entries=2048, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # path -> (signature, size, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, path, loader):
+        st = os.stat(path)
+        signature = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+        # 파일 읽기는 락 밖에서 (다른 세션을 막지 않도록)
+        data = loader(path)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if st.st_size <= self.max_bytes:
+                self._entries[path] = (signature, st.st_size, data)
+                self._bytes += st.st_size
+                self._evict()
+        return data
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, path):
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total else 0.0,
+            }
+
+
+CHART_CACHE = ChartCache(
+    max_entries=int(os.environ.get("CHART_CACHE_ENTRIES", 2048)),
+    max_bytes=int(os.environ.get("CHART_CACHE_BYTES", 64 * 1024 * 1024)),
+)
@@ -0,0 +1,83 @@
+from chart_record import RECORD_PATHS, OVERLAY_SLOTS
+from chart_schema import SCHEMA_VERSION, upgrade
+
+# 차트 JSON <-> 화면 값(form) 변환 (Streamlit app.py, PyQt chart_widget.py 공용)
+# form: {"name", "cid", "fields": [입력칸 18개], "pap_x", "pap_y", "layout", "tilt",
+#        "rotation", "memo", "toggle", "hand", "grip"}
+# 경로 표는 chart_record.RECORD_PATHS 하나만 쓰고, 최상위 키별로 묶어 두어
+# 불러올 때 .get()을 이어 부르지 않고 한 번 훑어서 채운다.
+# 저장 dict는 RECORD_PATHS 순서로 만들므로 두 화면의 저장 결과가 바이트 단위로 같다.
+
+# 값이 없을 때 기본값 (나머지는 "")
+DEFAULTS = {"toggle": False, "hand": "오른손", "grip": "클래식"}
+
+# 입력칸 slot 이름 -> fields 위치
+_FIELD_INDEX = {name: i for i, name in enumerate(OVERLAY_SLOTS)}
+
+# form 키 (입력칸이 아닌 값)
+_FORM_KEYS = {"pap_x", "pap_y", "layout", "tilt", "rotation", "memo", "toggle", "hand", "grip"}
+
+# 저장할 때 앞뒤 공백을 지우지 않는 값
+_KEEP_SPACES = {"name", "cid", "memo", "toggle", "hand", "grip"}
+
+
+def _build_decode_table():
+    # 최상위 키 -> ((나머지 경로, 입력칸 위치 또는 None, form 키), ...)
+    groups = {}
+    for name, path in RECORD_PATHS:
+        groups.setdefault(path[0], []).append((path[1:], _FIELD_INDEX.get(name), name))
+    return tuple((top, tuple(items)) for top, items in groups.items())
+
+
+_DECODE_TABLE = _build_decode_table()
+# (form 키, 상위 경로, 마지막 키, 입력칸 위치 또는 None, 공백 제거 여부)
+_ENCODE_TABLE = tuple(
+    (name, path[:-1], path[-1], _FIELD_INDEX.get(name), name not in _KEEP_SPACES)
+    for name, path in RECORD_PATHS
+)
+_EMPTY = {key: DEFAULTS.get(key, "") for key in _FORM_KEYS | {"name", "cid"}}
+
+
+def empty_form():
+    form = dict(_EMPTY)
+    form["fields"] = [""] * len(OVERLAY_SLOTS)
+    return form
+
+
+def decode(data):
+    # 차트 dict -> form (구버전 파일도 받는다)
+    if data.get("schema_version", 1) < SCHEMA_VERSION:
+        data = upgrade(data)[0]
+    form = empty_form()
+    fields = form["fields"]
+    for top, items in _DECODE_TABLE:
+        node = data.get(top)
+        if node is None:
+            continue
+        for rest, index, name in items:
+            value = node
+            for part in rest:
+                value = value.get(part) if isinstance(value, dict) else None
+            if value is None or isinstance(value, dict):
+                continue
+            if index is not None:
+                fields[index] = value
+            else:
+                form[name] = value
+    form["toggle"] = bool(form["toggle"])
+    return form
+
+
+def encode(form):
+    # form -> 저장할 차트 dict (schema_version은 save_data_as_json이 붙인다)
+    fields = form["fields"]
+    data = {}
+    for name, parents, last, index, strip in _ENCODE_TABLE:
+        value = fields[index] if index is not None else form.get(name, DEFAULTS.get(name, ""))
+        if strip:
+            value = value.strip()
+        node = data
+        for part in parents:
+            node = node.get(part) or node.setdefault(part, {})
+        node[last] = value
+    return data
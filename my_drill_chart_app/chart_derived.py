@@ -0,0 +1,115 @@
+from chart_record import OVERLAY_PATHS
+from measurement import OK, ALREADY_MM, parse_pitch, convert_oblong, thumb_mm
+
+# 변환 결과(mm 값, 엄지홀 이동량, 좌표)를 차트와 함께 저장해 두는 값
+# "변환값": {
+#     "입력": [피치 10칸, 엄지홀, hand],      # 이 값들로 계산했다는 표시
+#     "mm": [피치 10칸의 mm (변환하지 않는 칸은 null)],
+#     "엄지홀": "63>0.28",
+#     "좌표": {"fx": ..., "fy": ..., "sx": ..., "sy": ...}
+# }
+# 저장할 때 입력이 바뀐 경우에만 다시 계산하고, 화면의 "변환" 버튼은 입력이 같으면 저장된 값을 그대로 쓴다.
+# 언제든 입력칸 값으로 다시 계산할 수 있으므로 수정 이력에는 남기지 않는다.
+
+DERIVED_KEY = "변환값"
+
+# 변환하는 피치 칸 (입력칸 번호)
+PITCH_INDICES = (1, 2, 3, 5, 6, 7, 11, 12, 13, 14)
+THUMB_INDEX = 10
+# 좌표 계산에 쓰는 엄지 피치 칸: left, right, reverse, forward
+COORD_INDICES = (11, 12, 13, 14)
+
+_PITCH_PATHS = [OVERLAY_PATHS[i][1] for i in PITCH_INDICES]
+_THUMB_PATH = OVERLAY_PATHS[THUMB_INDEX][1]
+
+
+def _pick(data, path):
+    for part in path:
+        if not isinstance(data, dict):
+            return ""
+        data = data.get(part)
+    return data if isinstance(data, str) else ""
+
+
+def derived_inputs(data):
+    # 차트 dict에서 변환에 쓰는 입력값 목록
+    values = [_pick(data, p).strip() for p in _PITCH_PATHS] + [_pick(data, _THUMB_PATH).strip()]
+    return values + [data.get("hand") or "오른손"]
+
+
+def form_inputs(fields, hand):
+    # 화면 입력칸 값(18칸)에서 같은 목록
+    return [fields[i].strip() for i in PITCH_INDICES] + [fields[THUMB_INDEX].strip(), hand or "오른손"]
+
+
+def compute(inputs):
+    pitches, thumb, hand = inputs[:-2], inputs[-2], inputs[-1]
+    parsed = [parse_pitch(p) for p in pitches]
+    coord = {i: (mm if status in (OK, ALREADY_MM) else 0.0)
+             for i, (mm, status) in zip(PITCH_INDICES, parsed)}
+    left, right, reverse, forward = (coord[i] for i in COORD_INDICES)
+    t = thumb_mm(thumb)
+    # 왼손은 엄지 이동 방향이 반대
+    sign = -1 if hand == "왼손" else 1
+    return {
+        "입력": list(inputs),
+        "mm": [mm if status == OK else None for mm, status in parsed],
+        "엄지홀": convert_oblong(thumb.strip()),
+        "좌표": {
+            "fx": right - left - t,
+            "fy": forward - reverse + sign * t,
+            "sx": right - left + t,
+            "sy": forward - reverse - sign * t,
+        },
+    }
+
+
+def stored(data, inputs=None):
+    # 저장된 변환값 (입력이 바뀌었으면 None)
+    derived = data.get(DERIVED_KEY) if isinstance(data, dict) else None
+    if not isinstance(derived, dict):
+        return None
+    if inputs is None:
+        inputs = derived_inputs(data)
+    return derived if derived.get("입력") == inputs else None
+
+
+def derived_for(inputs, saved=None):
+    # 화면 "변환" 버튼용: 불러올 때 받은 변환값이 지금 입력과 같으면 그대로, 아니면 계산
+    if isinstance(saved, dict) and saved.get("입력") == inputs:
+        return saved
+    return compute(inputs)
+
+
+def derived_view(data):
+    # 저장된 값이 맞으면 그대로, 아니면 계산 (파일은 건드리지 않음)
+    return stored(data) or compute(derived_inputs(data))
+
+
+def materialize(data, previous=None):
+    # 저장할 dict에 변환값 붙이기 (이전 저장본과 입력이 같으면 다시 계산하지 않는다)
+    inputs = derived_inputs(data)
+    derived = stored(data, inputs) or (stored(previous, inputs) if previous else None) or compute(inputs)
+    if data.get(DERIVED_KEY) is derived:
+        return data
+    return dict(data, **{DERIVED_KEY: derived})
+
+
+def without_derived(data):
+    if DERIVED_KEY not in data:
+        return data
+    return {k: v for k, v in data.items() if k != DERIVED_KEY}
+
+
+def oriented(coords, center_toggle=False):
+    # 화면에 보이는 두 점 (first_x, first_y, second_x, second_y)
+    # 동서울그랜드볼링장(center_toggle)은 x/y 위치를 바꾸고 부호를 바꾼다
+    fx, fy, sx, sy = coords["fx"], coords["fy"], coords["sx"], coords["sy"]
+    if center_toggle:
+        return fy, -fx, sy, -sx
+    return fx, fy, sx, sy
+
+
+def mm_by_index(derived):
+    # 입력칸 번호 -> mm (변환하지 않는 칸 제외)
+    return {i: mm for i, mm in zip(PITCH_INDICES, derived["mm"]) if mm is not None}
@@ -0,0 +1,137 @@
+import os
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+# 고객별 수정 이력 (data/history/{이름}_{전화번호}.jsonl, 한 줄에 하나씩 추가만 한다)
+# - 보통은 바뀐 칸만 저장: {"rev": 3, "ts": ..., "set": {"중지/피치/left": "1/4"}, "unset": []}
+# - SNAPSHOT_EVERY번마다 전체 값을 저장: {"rev": 10, "ts": ..., "snapshot": {...}}
+#   그래서 특정 시점 복원은 그 이전 마지막 snapshot부터 몇 줄만 적용하면 된다.
+
+HISTORY_DIRNAME = "history"
+SNAPSHOT_EVERY = 10
+
+_lock = threading.Lock()
+
+
+def flatten(data, prefix=""):
+    flat = {}
+    for k, v in data.items():
+        path = f"{prefix}{k}"
+        if isinstance(v, dict) and v:
+            flat.update(flatten(v, path + "/"))
+        else:
+            flat[path] = v
+    return flat
+
+
+def unflatten(flat):
+    data = {}
+    for path, v in flat.items():
+        parts = path.split("/")
+        node = data
+        for part in parts[:-1]:
+            node = node.setdefault(part, {})
+        node[parts[-1]] = v
+    return data
+
+
+def history_path(folder, key):
+    return os.path.join(folder, HISTORY_DIRNAME, key + ".jsonl")
+
+
+def _read_log(folder, key):
+    try:
+        with open(history_path(folder, key), "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+
+def _apply(state, entry):
+    if "snapshot" in entry:
+        return dict(entry["snapshot"])
+    state = dict(state)
+    state.update(entry.get("set", {}))
+    for path in entry.get("unset", []):
+        state.pop(path, None)
+    return state
+
+
+def _replay(entries, until=None):
+    # until(epoch 초)까지의 상태 (그 이전 마지막 snapshot부터 적용)
+    if until is not None:
+        entries = [e for e in entries if e["ts"] <= until]
+    start = 0
+    for i, e in enumerate(entries):
+        if "snapshot" in e:
+            start = i
+    state = {}
+    for e in entries[start:]:
+        state = _apply(state, e)
+    return state
+
+
+def record_revision(folder, key, data):
+    # 저장할 때마다 호출: 이전 상태와 비교해 바뀐 칸만 추가 (바뀐 게 없으면 기록 안 함)
+    with _lock:
+        entries = _read_log(folder, key)
+        new = flatten(data)
+        rev = entries[-1]["rev"] + 1 if entries else 1
+        entry = {"rev": rev, "ts": time.time()}
+        if not entries or rev % SNAPSHOT_EVERY == 0:
+            entry["snapshot"] = new
+        else:
+            old = _replay(entries)
+            changed = {p: v for p, v in new.items() if p not in old or old[p] != v}
+            removed = [p for p in old if p not in new]
+            if not changed and not removed:
+                return None
+            entry["set"] = changed
+            entry["unset"] = removed
+        path = history_path(folder, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return rev
+
+
+def _to_epoch(when):
+    if isinstance(when, datetime):
+        return when.timestamp()
+    if isinstance(when, date):
+        # 날짜만 주면 그날 끝까지 포함
+        return datetime.combine(when + timedelta(days=1), datetime.min.time()).timestamp() - 1e-6
+    return float(when)
+
+
+def chart_as_of(folder, key, when):
+    # when 시점의 차트 (그 전에 저장된 적이 없으면 None)
+    entries = _read_log(folder, key)
+    until = _to_epoch(when)
+    if not entries or entries[0]["ts"] > until:
+        return None
+    return unflatten(_replay(entries, until))
+
+
+def list_revisions(folder, key):
+    result = []
+    for e in _read_log(folder, key):
+        changed = list(e["snapshot"]) if "snapshot" in e else list(e["set"]) + e["unset"]
+        result.append({"rev": e["rev"], "ts": e["ts"], "snapshot": "snapshot" in e, "changed": changed})
+    return result
+
+
+def compact(folder, key):
+    # 마지막 상태를 snapshot 한 줄로 추가 (다음 복원은 여기서부터)
+    with _lock:
+        entries = _read_log(folder, key)
+        if not entries or "snapshot" in entries[-1]:
+            return None
+        entry = {"rev": entries[-1]["rev"] + 1, "ts": entries[-1]["ts"], "snapshot": _replay(entries)}
+        with open(history_path(folder, key), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return entry["rev"]
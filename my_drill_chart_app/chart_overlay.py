@@ -0,0 +1,80 @@
+import os
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from chart_assets import asset_src
+
+# 차트 오버레이 컴포넌트 (chart_overlay_frontend/index.html, 빌드 없이 쓰는 JS 한 파일)
+# components.html은 재실행마다 HTML 전체를 새 iframe으로 다시 띄우지만,
+# 이 컴포넌트는 같은 key로 계속 화면에 남아 있고 바뀐 값만 주고받는다.
+# - 앱 -> 화면: {"rev": 번호, "base": 이전 번호 또는 None(전체), "set": {바뀐 값},
+#              "ack": {"page": 화면 id, "seq": 받은 편집 번호}}
+#   화면은 자기가 가진 rev와 base가 같을 때만 적용하고, 다르면 (새로 열린 iframe 등) 전체를 다시 달라고 한다.
+# - 화면 -> 앱: {"page": 화면 id, "seq": 편집 번호, "edits": {"field3": "1/4", ...}, "resync": 전체 요청 번호,
+#              "inline": 배경 이미지를 받지 못함 (이후 이 세션은 base64로 보낸다)}
+#   edits는 앱이 ack로 받았다고 알려줄 때까지 모아서 보낸다 (값을 덮어써도 빠지는 편집이 없도록).
+#   화면 id는 iframe이 열릴 때마다 새로 만든다. seq/resync는 화면마다 0부터 세므로
+#   id가 바뀌면 앱도 번호와 보낸 값을 처음부터 다시 센다 (ack도 같은 화면에만 적용된다).
+# 상태 값 (state):
+#   "layout": 입력칸 style 목록, "coord_layout": 좌표칸 style 목록, "placeholders": 입력칸 이름 목록,
+#   "svg": image_src 결과, "height": 높이(px), "field0"~: 입력칸 값, "coords": 좌표칸 글자,
+#   "hidden": 숨길 입력칸 번호, "editable": 입력칸 편집 가능 여부
+
+_FRONTEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "chart_overlay_frontend")
+_component = components.declare_component("chart_overlay", path=_FRONTEND)
+# 배경 SVG를 내용 해시 이름으로 복사해 두는 곳 (컴포넌트 주소 아래 "assets/"로 받는다)
+ASSET_DIR = os.path.join(_FRONTEND, "assets")
+
+
+def _sync(key):
+    # 세션별로 화면에 보낸 값과 번호
+    name = f"_{key}_sync"
+    if name not in st.session_state:
+        st.session_state[name] = {"rev": 0, "sent": None, "page": None, "seq": 0, "resync": 0, "inline": False}
+    return st.session_state[name]
+
+
+def overlay_edits(key="chart_overlay"):
+    # 화면에서 새로 받은 편집 {"field3": "1/4"} (이미 반영한 편집이면 빈 dict)
+    # 화면에 그리기(chart_overlay) 전에 불러서 세션 값에 반영한다
+    sync = _sync(key)
+    value = st.session_state.get(key) or {}
+    page = value.get("page")
+    if page is not None and page != sync["page"]:
+        # 새로 열린 iframe: 번호는 0부터 (받은 값이 모자라면 화면이 resync로 전체를 요청한다)
+        sync.update(page=page, seq=0, resync=0)
+    if value.get("inline"):
+        sync["inline"] = True
+    if value.get("resync", 0) > sync["resync"]:
+        sync["resync"] = value["resync"]
+        sync["sent"] = None
+    if value.get("seq", 0) <= sync["seq"]:
+        return {}
+    sync["seq"] = value["seq"]
+    edits = value.get("edits") or {}
+    # 화면은 이미 이 값을 가지고 있으므로 다시 보내지 않는다
+    if sync["sent"] is not None:
+        sync["sent"].update(edits)
+    return edits
+
+
+def image_src(path, key="chart_overlay"):
+    # 배경 이미지: 앱과 같은 주소의 정적 파일, 화면이 받지 못했다고 알려 오면 base64
+    return asset_src(path, ASSET_DIR, "assets/", inline=_sync(key)["inline"])
+
+
+def chart_overlay(state, key="chart_overlay"):
+    # state 중 지난번에 보낸 것과 다른 값만 보낸다
+    sync = _sync(key)
+    sent = sync["sent"]
+    if sent is None:
+        changes, base = dict(state), None
+    else:
+        changes = {k: v for k, v in state.items() if sent.get(k) != v}
+        base = sync["rev"]
+    if changes:
+        sync["rev"] += 1
+        sync["sent"] = dict(state)
+    # 바뀐 값이 없으면 빈 변경 (화면은 같은 rev를 무시하고 ack만 보며, 새로 열린 iframe은 전체를 다시 요청한다)
+    _component(rev=sync["rev"], base=base, set=changes, ack={"page": sync["page"], "seq": sync["seq"]}, key=key, default=None)
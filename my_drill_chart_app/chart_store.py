@@ -0,0 +1,534 @@
+import os
+import json
+import hashlib
+import sqlite3
+import threading
+from chart_cache import CHART_CACHE
+from atomic_write import file_lock, write_atomic
+from serializer import SERIALIZER
+from compression import FILE_SUFFIXES, decompress_file_bytes, codec_of, compress_bytes
+
+# 차트 저장소
+# - DirChartStore: 기존 방식 (data 폴더를 매번 스캔)
+# - SqliteChartStore: data 폴더 안의 SQLite(WAL) 인덱스로 목록/검색/존재 확인
+# 차트 본문은 두 경우 모두 data/{이름}_{전화번호}.json 파일에 그대로 저장된다.
+# (오래된 차트는 cold_storage.py가 .json.gz / .json.zst / .json.xz 로 압축해 둘 수 있고, 읽을 때 자동으로 풀린다)
+
+INDEX_FILENAME = "charts.sqlite3"
+RECENT_FILENAME = ".recent"
+COUNTERS_FILENAME = ".counters"  # 자동 생성 이름 번호 (DirChartStore)
+LAYOUT_FILENAME = ".layout"  # 내용이 "sharded"면 data/ab/cd/{key}.json 구조
+MRU_SIZE = 20
+
+# 같은 차트의 저장(save)과 스키마 변환 다시 쓰기(rewrite_chart_file)가 한 프로세스 안에서 겹치지 않도록
+# (key 해시로 나눈 고정 개수의 lock, 다른 프로세스와는 rewrite_chart_file의 signature 확인으로)
+_KEY_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def chart_key(name, cid):
+    return f"{name}_{cid}"
+
+
+def split_key(key):
+    # "이름_1_1" 처럼 이름에 _가 들어갈 수 있으므로 마지막 _ 기준으로 나눈다
+    name, _, cid = key.rpartition("_")
+    return name, cid
+
+
+def key_lock(key):
+    return _KEY_LOCKS[hash(key) % len(_KEY_LOCKS)]
+
+
+def chart_meta(data):
+    # 인덱스에 올릴 값 (그립은 구버전 키 "그립방식"도 확인)
+    return {
+        "name": data.get("이름", ""),
+        "cid": data.get("전화번호뒷자리", ""),
+        "hand": data.get("hand", "오른손"),
+        "grip": data.get("grip", data.get("그립방식", "클래식")),
+    }
+
+
+def write_chart_file(filepath, data):
+    # 임시 파일 + fsync + rename
+    write_atomic(filepath, SERIALIZER.dumps(data))
+
+
+def file_signature(st):
+    # 저장은 항상 새 파일로 바꿔 끼우므로(write_atomic) inode까지 보면 그 사이 저장을 놓치지 않는다
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def read_chart_file(filepath, with_signature=False):
+    # with_signature=True면 (data, 읽은 파일의 file_signature)
+    with open(filepath, "rb") as f:
+        raw = f.read()
+        signature = file_signature(os.fstat(f.fileno()))
+    data = SERIALIZER.loads(decompress_file_bytes(filepath, raw))
+    return (data, signature) if with_signature else data
+
+
+def rewrite_chart_file(filepath, data, signature=None):
+    # 내용만 바꿔 쓰기 (스키마 변환용 - 압축 형식과 수정 시간은 그대로)
+    # signature: 읽을 때의 file_signature. 그 사이 새로 저장되었으면 쓰지 않고 False
+    # 임시 파일을 먼저 쓰고(fsync) 확인과 rename만 lock 안에서 연달아 한다
+    # (fsync 도중 다른 프로세스가 저장해도 확인에서 걸린다. 수정 시간은 바꿔 끼우기 전에 임시 파일에)
+    payload = SERIALIZER.dumps(data)
+    codec = codec_of(filepath)
+    if codec:
+        payload = compress_bytes(codec, payload)[1]
+
+    def unchanged(tmp):
+        st = os.stat(filepath)
+        if signature is not None and file_signature(st) != signature:
+            return False
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return True
+
+    written = write_atomic(filepath, payload, lock=key_lock(chart_file_key(os.path.basename(filepath))),
+                           replace_if=unchanged)
+    if written:
+        CHART_CACHE.invalidate(filepath)
+    return written
+
+
+def chart_file_key(filename):
+    # "신현감_8781.json" / "신현감_8781.json.gz" -> "신현감_8781" (차트 파일이 아니면 None)
+    for suffix in FILE_SUFFIXES:
+        ext = ".json" + suffix
+        if filename.endswith(ext):
+            return filename[:-len(ext)]
+    return None
+
+
+def shard_dirs(key):
+    # 고객 key 해시 앞 4글자로 2단계 폴더 ("신현감_8781" -> ("3f", "a2"))
+    h = hashlib.md5(key.encode("utf-8")).hexdigest()
+    return h[:2], h[2:4]
+
+
+def is_shard_dir(name):
+    return len(name) == 2 and all(c in "0123456789abcdef" for c in name)
+
+
+def iter_chart_files(folder):
+    # 차트 파일 경로 전체 (평면/샤딩 구조, 압축본 포함) - 유지보수 도구용
+    if not os.path.isdir(folder):
+        return
+    for entry in os.scandir(folder):
+        if is_shard_dir(entry.name) and entry.is_dir():
+            for sub in os.scandir(entry.path):
+                if is_shard_dir(sub.name) and sub.is_dir():
+                    for f in os.scandir(sub.path):
+                        if chart_file_key(f.name) is not None:
+                            yield f.path
+        elif entry.is_file() and chart_file_key(entry.name) is not None:
+            yield entry.path
+
+
+def read_layout(folder):
+    try:
+        with open(os.path.join(folder, LAYOUT_FILENAME), "r", encoding="utf-8") as f:
+            return f.read().strip() or "flat"
+    except OSError:
+        return os.environ.get("CHART_LAYOUT", "flat")
+
+
+def placeholder_number(key, base):
+    # "이름_3_3", "이름_3_1234" -> 3 (자동 생성 이름이 아니면 None)
+    name = split_key(key)[0]
+    prefix = base + "_"
+    if name.startswith(prefix) and name[len(prefix):].isdigit():
+        return int(name[len(prefix):])
+    return None
+
+
+class DirChartStore:
+    def __init__(self, folder="data"):
+        self.folder = folder
+        self.sharded = read_layout(folder) == "sharded"
+        self._counter_lock = threading.Lock()
+        self._recent_lock = threading.Lock()
+
+    def flat_path(self, key):
+        return os.path.join(self.folder, key + ".json")
+
+    def shard_path(self, key):
+        return os.path.join(self.folder, *shard_dirs(key), key + ".json")
+
+    def path_for(self, key):
+        # 새로 저장할 위치
+        return self.shard_path(key) if self.sharded else self.flat_path(key)
+
+    def _existing(self, path):
+        # path(.json) 또는 그 압축본 중 실제 있는 파일
+        for suffix in FILE_SUFFIXES:
+            if os.path.exists(path + suffix):
+                return path + suffix
+        return None
+
+    def locate(self, key):
+        # 읽을 위치: 폴더 목록 없이 정해진 몇 개 경로만 stat
+        # (마이그레이션 중이거나 다른 설정의 프로세스가 저장했으면 반대쪽 위치가 더 최신일 수 있다)
+        primary = self._existing(self.path_for(key))
+        other = self._existing(self.flat_path(key) if self.sharded else self.shard_path(key))
+        if other is None:
+            return primary or self.path_for(key)
+        if primary is None or os.path.getmtime(other) > os.path.getmtime(primary):
+            return other
+        return primary
+
+    def save(self, name, cid, data):
+        key = chart_key(name, cid)
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with key_lock(key):
+            write_chart_file(path, data)
+            CHART_CACHE.invalidate(path)
+            # 예전 위치의 파일이나 압축본이 남아 있으면 지운다
+            for base in (self.flat_path(key), self.shard_path(key)):
+                for suffix in FILE_SUFFIXES:
+                    old = base + suffix
+                    if old != path and os.path.exists(old):
+                        os.remove(old)
+        self._touch_recent(key)
+        return key
+
+    def _touch_recent(self, key):
+        # 최근 저장 목록 (data/.recent)을 맨 앞에 key를 넣어 다시 쓴다
+        # 읽고 다시 쓰는 사이에 다른 저장이 끼지 않도록 lock, 임시 파일 이름은 write_atomic이 프로세스/스레드별로
+        with self._recent_lock:
+            recent = [k for k in self._read_recent() if k != key]
+            recent.insert(0, key)
+            payload = json.dumps(recent[:MRU_SIZE], ensure_ascii=False).encode("utf-8")
+            write_atomic(os.path.join(self.folder, RECENT_FILENAME), payload)
+
+    def _read_recent(self):
+        try:
+            with open(os.path.join(self.folder, RECENT_FILENAME), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return []
+
+    def recent(self, n=MRU_SIZE):
+        keys = [k for k in self._read_recent() if os.path.exists(self.locate(k))]
+        if not keys and os.path.isdir(self.folder):
+            # 목록 파일이 아직 없으면 (구버전 데이터) 한 번만 수정시간으로 정렬한다
+            keys = sorted(DirChartStore.keys(self),
+                          key=lambda k: os.path.getmtime(self.locate(k)), reverse=True)
+        return keys[:n]
+
+    def latest(self):
+        recent = self.recent(1)
+        return recent[0] if recent else None
+
+    def load(self, key):
+        return CHART_CACHE.get(self.locate(key), read_chart_file)
+
+    def exists(self, key):
+        return os.path.exists(self.locate(key))
+
+    def keys(self):
+        if not os.path.isdir(self.folder):
+            return []
+        keys = []
+        for entry in os.scandir(self.folder):
+            if is_shard_dir(entry.name) and entry.is_dir():
+                for sub in os.scandir(entry.path):
+                    if is_shard_dir(sub.name) and sub.is_dir():
+                        keys.extend(chart_file_key(f) for f in os.listdir(sub.path))
+            elif entry.is_file():
+                keys.append(chart_file_key(entry.name))
+        return sorted(set(k for k in keys if k is not None))
+
+    def allocate_placeholder(self, base="이름"):
+        # 이름/전화번호 없이 저장할 때 쓸 번호
+        # 카운터는 data/.counters에 저장하고 파일 lock을 잡고 올리므로 (처음 한 번만 폴더를 본다)
+        # 다른 프로세스(PyQt 앱, 다른 서버)와 동시에 저장해도 같은 번호를 받지 않는다
+        path = os.path.join(self.folder, COUNTERS_FILENAME)
+        os.makedirs(self.folder, exist_ok=True)
+        with self._counter_lock, file_lock(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    counters = json.load(f)
+            except (OSError, ValueError):
+                counters = {}
+            if base not in counters:
+                used = [placeholder_number(k, base) for k in DirChartStore.keys(self)]
+                counters[base] = max([n for n in used if n is not None], default=0)
+            counters[base] += 1
+            write_atomic(path, json.dumps(counters, ensure_ascii=False).encode("utf-8"))
+            return counters[base]
+
+    def keys_since(self, marker):
+        # 검색 인덱스 동기화용: (새 marker, 그 사이 추가된 key 목록 또는 None=전체 다시)
+        try:
+            current = os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return None, []
+        if marker == current:
+            return marker, []
+        return current, None
+
+    def search(self, text="", limit=None):
+        found = [k for k in self.keys() if text in k]
+        return found[:limit] if limit else found
+
+
+class SqliteChartStore(DirChartStore):
+    def __init__(self, folder="data", reconcile=True):
+        super().__init__(folder)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            os.path.join(folder, INDEX_FILENAME),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=10,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        if self._get_meta("built") is None:
+            self.rebuild()
+        elif reconcile:
+            # 앱 밖에서 data 폴더에 넣거나 지운 파일 반영 (프로세스 시작 시 한 번)
+            self.reconcile()
+
+    def _create_schema(self):
+        with self._lock:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS charts (
+                    key   TEXT PRIMARY KEY,
+                    name  TEXT NOT NULL,
+                    cid   TEXT NOT NULL,
+                    hand  TEXT,
+                    grip  TEXT,
+                    mtime REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS charts_name ON charts(name);
+                CREATE INDEX IF NOT EXISTS charts_cid ON charts(cid);
+                CREATE INDEX IF NOT EXISTS charts_hand_grip ON charts(hand, grip);
+                CREATE INDEX IF NOT EXISTS charts_mtime ON charts(mtime);
+                CREATE TABLE IF NOT EXISTS recent (
+                    key      TEXT PRIMARY KEY,
+                    saved_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS recent_saved_at ON recent(saved_at);
+                CREATE TABLE IF NOT EXISTS counters (
+                    base  TEXT PRIMARY KEY,
+                    value INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS meta (
+                    k TEXT PRIMARY KEY,
+                    v TEXT
+                );
+            """)
+
+    def _get_meta(self, k):
+        with self._lock:
+            row = self._conn.execute("SELECT v FROM meta WHERE k = ?", (k,)).fetchone()
+        return row[0] if row else None
+
+    def _index_row(self, key, data, mtime):
+        meta = chart_meta(data)
+        name, cid = split_key(key)
+        return (key, meta["name"] or name, meta["cid"] or cid, meta["hand"], meta["grip"], mtime)
+
+    def _read_row(self, key):
+        # 파일을 읽어 인덱스 행 만들기 (읽을 수 없으면 None)
+        path = self.locate(key)
+        try:
+            return self._index_row(key, read_chart_file(path), os.path.getmtime(path))
+        except Exception as e:
+            print(f"인덱스 추가 실패: {key} ({e})")
+            return None
+
+    def _bump_generation(self):
+        # 행이 지워졌다는 표시 (keys_since가 rowid만으로는 알 수 없으므로 검색 인덱스가 전체를 다시 읽게)
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta VALUES ('generation', "
+            "COALESCE((SELECT CAST(v AS INTEGER) FROM meta WHERE k = 'generation'), 0) + 1)")
+
+    def _drop(self, keys):
+        # 파일이 없어진 key를 인덱스에서 빼기
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("DELETE FROM charts WHERE key = ?", [(k,) for k in keys])
+                self._conn.executemany("DELETE FROM recent WHERE key = ?", [(k,) for k in keys])
+                self._bump_generation()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def reconcile(self):
+        # 폴더와 인덱스 맞추기: 폴더에만 있는 파일은 읽어서 추가, 인덱스에만 있는 key는 뺀다
+        # 폴더 목록만 훑고 내용은 새로 들어온 파일만 읽는다 -> (추가 수, 삭제 수)
+        on_disk = set(DirChartStore.keys(self))
+        with self._lock:
+            indexed = {r[0] for r in self._conn.execute("SELECT key FROM charts")}
+        rows = [row for row in map(self._read_row, sorted(on_disk - indexed)) if row is not None]
+        if rows:
+            with self._lock:
+                self._conn.executemany("INSERT OR REPLACE INTO charts VALUES (?, ?, ?, ?, ?, ?)", rows)
+        removed = sorted(indexed - on_disk)
+        if removed:
+            self._drop(removed)
+        return len(rows), len(removed)
+
+    def rebuild(self):
+        # 최초 1회 (또는 인덱스 복구 시, rebuild_index.py) 폴더 전체를 읽어 인덱스를 만든다
+        rows = []
+        for key in DirChartStore.keys(self):
+            path = self.locate(key)
+            try:
+                data = read_chart_file(path)
+            except Exception as e:
+                print(f"인덱스 생성 실패: {key} ({e})")
+                continue
+            rows.append(self._index_row(key, data, os.path.getmtime(path)))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("DELETE FROM charts")
+                self._conn.executemany("INSERT INTO charts VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self._conn.execute("DELETE FROM recent")
+                self._conn.execute(
+                    "INSERT INTO recent SELECT key, mtime FROM charts ORDER BY mtime DESC LIMIT ?",
+                    (MRU_SIZE,))
+                self._conn.execute("INSERT OR REPLACE INTO meta VALUES ('built', '1')")
+                self._bump_generation()
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _touch_recent(self, key):
+        # 인덱스 갱신과 같은 트랜잭션에서 save() 안에서 처리한다
+        pass
+
+    def save(self, name, cid, data):
+        key = super().save(name, cid, data)
+        row = self._index_row(key, data, os.path.getmtime(self.path_for(key)))
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("INSERT OR REPLACE INTO charts VALUES (?, ?, ?, ?, ?, ?)", row)
+                self._conn.execute("INSERT OR REPLACE INTO recent VALUES (?, ?)", (key, row[5]))
+                self._conn.execute(
+                    "DELETE FROM recent WHERE key NOT IN "
+                    "(SELECT key FROM recent ORDER BY saved_at DESC LIMIT ?)", (MRU_SIZE,))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return key
+
+    def allocate_placeholder(self, base="이름"):
+        # 카운터는 DB에 저장되고 BEGIN IMMEDIATE로 잠근 상태에서 올리므로
+        # 두 프로세스가 동시에 저장해도 같은 번호를 받지 않는다
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT value FROM counters WHERE base = ?", (base,)).fetchone()
+                if row is None:
+                    names = self._conn.execute(
+                        "SELECT key FROM charts WHERE substr(name, 1, ?) = ?",
+                        (len(base) + 1, base + "_"))
+                    used = [placeholder_number(r[0], base) for r in names]
+                    value = max([n for n in used if n is not None], default=0) + 1
+                else:
+                    value = row[0] + 1
+                self._conn.execute("INSERT OR REPLACE INTO counters VALUES (?, ?)", (base, value))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return value
+
+    def recent(self, n=MRU_SIZE):
+        while True:
+            with self._lock:
+                keys = [r[0] for r in self._conn.execute(
+                    "SELECT key FROM recent ORDER BY saved_at DESC LIMIT ?", (n,))]
+            # 앱 밖에서 지워진 파일은 빼고 다음 것으로 채운다
+            gone = [k for k in keys if not DirChartStore.exists(self, k)]
+            if not gone:
+                return keys
+            self._drop(gone)
+
+    def exists(self, key):
+        with self._lock:
+            row = self._conn.execute("SELECT 1 FROM charts WHERE key = ?", (key,)).fetchone()
+        if row is not None:
+            return True
+        # 인덱스에 없으면 폴더 확인 (앱 밖에서 복사해 넣은 파일은 이때 인덱스에 올린다)
+        if not DirChartStore.exists(self, key):
+            return False
+        row = self._read_row(key)
+        if row is not None:
+            with self._lock:
+                self._conn.execute("INSERT OR REPLACE INTO charts VALUES (?, ?, ?, ?, ?, ?)", row)
+        return True
+
+    def keys(self):
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT key FROM charts ORDER BY key")]
+
+    def keys_since(self, marker):
+        # INSERT OR REPLACE는 항상 새 rowid를 받으므로 rowid로 변경분을 찾는다
+        # marker: (max rowid, generation) - 지워진 행이 있으면 generation이 바뀌어 전체를 다시 읽는다
+        with self._lock:
+            rowid = self._conn.execute("SELECT max(rowid) FROM charts").fetchone()[0] or 0
+            current = (rowid, self._get_meta("generation"))
+            if marker is None or current[1] != marker[1] or rowid < marker[0]:
+                return current, None
+            keys = [r[0] for r in self._conn.execute(
+                "SELECT key FROM charts WHERE rowid > ?", (marker[0],))]
+        return current, keys
+
+    def find(self, name=None, cid=None, hand=None, grip=None):
+        conds, args = [], []
+        for col, val in (("name", name), ("cid", cid), ("hand", hand), ("grip", grip)):
+            if val is not None:
+                conds.append(f"{col} = ?")
+                args.append(val)
+        sql = "SELECT key FROM charts"
+        if conds:
+            sql += " WHERE " + " AND ".join(conds)
+        with self._lock:
+            return [r[0] for r in self._conn.execute(sql + " ORDER BY key", args)]
+
+    def search(self, text="", limit=None):
+        # 부분 문자열 검색 (파일 목록 대신 인덱스 테이블만 훑는다)
+        sql = "SELECT key FROM charts WHERE instr(key, ?) > 0 ORDER BY key"
+        args = [text]
+        if limit:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            return [r[0] for r in self._conn.execute(sql, args)]
+
+
+STORE_BACKENDS = {
+    "dir": DirChartStore,
+    "sqlite": SqliteChartStore,
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(folder="data", backend=None):
+    # 폴더별로 저장소 하나만 만든다 (CHART_STORE 환경변수로 백엔드 선택)
+    backend = backend or os.environ.get("CHART_STORE", "sqlite")
+    cache_key = (os.path.abspath(folder), backend)
+    with _stores_lock:
+        store = _stores.get(cache_key)
+        if store is None:
+            store = STORE_BACKENDS[backend](folder)
+            _stores[cache_key] = store
+        return store
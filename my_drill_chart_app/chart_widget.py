@@ -1,57 +1,43 @@
-import os
-import json
-import re
 from PyQt5.QtWidgets import (
     QWidget, QLineEdit, QPushButton, QMessageBox, QInputDialog,
     QDialog, QVBoxLayout, QListWidget, QListWidgetItem, QTextEdit,
-    QLabel, QCheckBox, QRadioButton, QButtonGroup
+    QLabel, QCheckBox, QRadioButton, QButtonGroup, QListView
 )
 from PyQt5.QtSvg import QSvgWidget, QSvgRenderer
 from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
-from data_manager import save_data_as_json
-
-# 엄지홀 변환 함수
-def parse_thumb_oblong_strict(value: str) -> str:
-    try:
-        if ">" in value:
-            base, after = value.split(">")
-            if "))" in after:
-                after, after_barbell = after.split("))")
-                after_barbell = "))" + after_barbell
-            else:
-                after_barbell = ""
-
-            valid_range = range(33, 96)
-
-            def get_64_value(val_str):
-                if '.' in val_str:
-                    return None  # 이미 변환된 값
-                val_int = int(val_str)
-                # 우선 1배부터 체크 (즉, 그대로 사용)
-                if val_int in valid_range:
-                    return val_int
-                for f in [2, 4, 8, 16]:
-                    candidate = val_int * f
-                    if candidate in valid_range:
-                        return candidate
-                return None
-
-            before_64 = get_64_value(base.strip())
-            after_64 = get_64_value(after.strip())
-
-            if before_64 is None or after_64 is None:
-                return value
-
-            diff = abs(after_64 - before_64)
-            move = (diff / 2) / 64  # inch
-            mm = round(move * 25.4 * 0.7071, 2)
-            return f"{base}>{mm:.2f}{after_barbell}"
-
-    except Exception as e:
-        print(f"엄지홀 변환 오류: {e}")
-    return value
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from data_manager import save_data_as_json, load_chart, chart_exists, search_charts, allocate_placeholder_id
+from chart_codec import decode as decode_chart, encode as encode_chart
+from measurement import format_mm
+from chart_derived import DERIVED_KEY, derived_for, form_inputs, mm_by_index
+
+
+# 불러오기 목록용 모델: 검색 인덱스 결과(key 목록)만 들고 있고
+# QListView가 화면에 보이는 행만 data()로 가져간다
+class ChartListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []
+        self._filter_text = None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return self._keys[index.row()]
+        return None
+
+    def set_filter_text(self, text):
+        if text == self._filter_text:
+            return
+        self._filter_text = text
+        self.beginResetModel()
+        self._keys = search_charts(text)
+        self.endResetModel()
 
+    def key_at(self, index):
+        return self._keys[index.row()]
 
 
 class ChartWindow(QWidget):
@@ -318,6 +304,7 @@ class ChartWindow(QWidget):
         self.convert_mode = False  # 변환 상태 여부
         self.original_values = {}  # 원래 값을 저장해두는 딕셔너리
         self.current_data = {}
+        self.derived = None  # 불러온 차트에 저장된 변환값
         
                         # 2x2 입력칸 (가로로 넓게, 세로로 촘촘하게)
                 # 2x2 입력칸 (가로로 넓게, 세로로 촘촘하게)
@@ -524,52 +511,26 @@ class ChartWindow(QWidget):
 
             if not name or not cid:
                 base_name = "이름"
-                existing = os.listdir("data")
-                count = 1
-                while f"{base_name}_{count}.json" in existing:
-                    count += 1
+                count = allocate_placeholder_id(base_name)
                 if not name:
                     name = f"{base_name}_{count}"
                 if not cid:
                     cid = f"{count}"
 
-            values = [f.text().strip() for f in self.field_inputs]
-            data = {
-                "이름": name,
-                "전화번호뒷자리": cid,
-                "중지": {
-                    "사이즈": values[0],
-                    "피치": {"left": values[1], "reverse": values[2], "forward": values[3]}
-                },
-                "약지": {
-                    "사이즈": values[4],
-                    "피치": {"right": values[5], "reverse": values[6], "forward": values[7]}
-                },
-                "스팬": {"중지": values[8], "약지": values[9]},
-                "엄지": {
-                    "사이즈": values[10],
-                    "피치": {
-                        "left": values[11], "right": values[12],
-                        "reverse": values[13], "forward": values[14]
-                    }
-                },
-                "PAP": {
-                    "수평": self.pap_x_input.text().strip(),
-                    "수직": self.pap_y_input.text().strip()
-                },
-                "레이아웃": self.layout_input.text().strip(),
-                "틸트": self.tilt_input.text().strip(),
-                "로테이션": self.rotation_input.text().strip(),
-                "메모": self.memo_box.toPlainText(),
-                "CUT": {
-                    "중약지": values[15],
-                    "엄지": values[16]
-                },
-                "브릿지": values[17],
-                "토글상태": self.center_toggle.isChecked(),
+            data = encode_chart({
+                "name": name,
+                "cid": cid,
+                "fields": [f.text() for f in self.field_inputs],
+                "pap_x": self.pap_x_input.text(),
+                "pap_y": self.pap_y_input.text(),
+                "layout": self.layout_input.text(),
+                "tilt": self.tilt_input.text(),
+                "rotation": self.rotation_input.text(),
+                "memo": self.memo_box.toPlainText(),
+                "toggle": self.center_toggle.isChecked(),
                 "hand": "왼손" if self.left_radio.isChecked() else "오른손",
-                "grip": "덤리스" if self.thumbless_radio.isChecked() else "클래식"
-            }
+                "grip": "덤리스" if self.thumbless_radio.isChecked() else "클래식",
+            })
             self.memo_box.setReadOnly(True)
 
             save_data_as_json(name, cid, data)
@@ -668,17 +629,13 @@ class ChartWindow(QWidget):
         file_list.setDisabled(True)  # 클릭 방지용 비활성화
         layout.addWidget(file_list)
 
-        directory = os.path.join(os.getcwd(), "data")
-        all_files = [f for f in os.listdir(directory) if f.endswith(".json")]
-
         def update_file_list():
             name_filter = name_input.text().strip()
             id_filter = id_input.text().strip()
             file_list.clear()
-            for file in all_files:
-                base = file.replace(".json", "")
-                if name_filter in base and id_filter in base:
-                    file_list.addItem(file)
+            for base in search_charts(name_filter):
+                if id_filter in base:
+                    file_list.addItem(base + ".json")
 
         name_input.textChanged.connect(update_file_list)
         id_input.textChanged.connect(update_file_list)
@@ -695,8 +652,7 @@ class ChartWindow(QWidget):
                 return
 
             filename = f"{name}_{cid}.json"
-            filepath = os.path.join(directory, filename)
-            if os.path.exists(filepath):
+            if chart_exists(name, cid):
                 QMessageBox.critical(dialog, "중복 오류", f"이미 존재하는 이름+ID 조합입니다: {filename}")
                 return
                 
@@ -787,90 +743,50 @@ class ChartWindow(QWidget):
         search_input.setPlaceholderText("이름 또는 전화번호 뒷자리 검색")
         layout.addWidget(search_input)
     
-        list_widget = QListWidget()
-        layout.addWidget(list_widget)
-    
-        all_files = [f for f in os.listdir("data") if f.endswith(".json")]
+        list_model = ChartListModel(dialog)
+        list_view = QListView()
+        list_view.setModel(list_model)
+        list_view.setUniformItemSizes(True)  # 행 높이 계산 생략 (보이는 행만 그림)
+        layout.addWidget(list_view)
     
-        def update_list(filter_text=""):
-            list_widget.clear()
-            for file in all_files:
-                display = file.replace(".json", "")
-                if filter_text in display:
-                    list_widget.addItem(display)
+        # 입력이 멈춘 뒤에만 검색 (글자마다 목록을 다시 만들지 않도록)
+        search_timer = QTimer(dialog)
+        search_timer.setSingleShot(True)
+        search_timer.setInterval(120)
+        search_timer.timeout.connect(lambda: list_model.set_filter_text(search_input.text()))
     
-        update_list()
-        search_input.textChanged.connect(lambda text: update_list(text))
+        list_model.set_filter_text("")
+        search_input.textChanged.connect(lambda text: search_timer.start())
     
-        def on_item_selected(item):
+        def on_item_selected(index):
             # ✅ 편집모드 진입 막기
             self.edit_mode = False
             self.edit_button.setText("편집")
     
-            file_path = os.path.join("data", item.text() + ".json")
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-    
-            self.name_input.setText(data.get("이름", ""))
-            self.id_input.setText(data.get("전화번호뒷자리", ""))
-    
-            self.field_inputs[0].setText(data.get("중지", {}).get("사이즈", ""))
-            self.field_inputs[1].setText(data.get("중지", {}).get("피치", {}).get("left", ""))
-            self.field_inputs[2].setText(data.get("중지", {}).get("피치", {}).get("reverse", ""))
-            self.field_inputs[3].setText(data.get("중지", {}).get("피치", {}).get("forward", ""))
-            self.field_inputs[4].setText(data.get("약지", {}).get("사이즈", ""))
-            self.field_inputs[5].setText(data.get("약지", {}).get("피치", {}).get("right", ""))
-            self.field_inputs[6].setText(data.get("약지", {}).get("피치", {}).get("reverse", ""))
-            self.field_inputs[7].setText(data.get("약지", {}).get("피치", {}).get("forward", ""))
-            self.field_inputs[8].setText(data.get("스팬", {}).get("중지", ""))
-            self.field_inputs[9].setText(data.get("스팬", {}).get("약지", ""))
-            self.field_inputs[10].setText(data.get("엄지", {}).get("사이즈", ""))
-            self.field_inputs[11].setText(data.get("엄지", {}).get("피치", {}).get("left", ""))
-            self.field_inputs[12].setText(data.get("엄지", {}).get("피치", {}).get("right", ""))
-            self.field_inputs[13].setText(data.get("엄지", {}).get("피치", {}).get("reverse", ""))
-            self.field_inputs[14].setText(data.get("엄지", {}).get("피치", {}).get("forward", ""))
-            self.field_inputs[15].setText(data.get("CUT", {}).get("중약지", ""))
-            self.field_inputs[16].setText(data.get("CUT", {}).get("엄지", ""))
-            self.field_inputs[17].setText(data.get("브릿지", ""))
-    
-            pap_data = data.get("PAP", {})
-            if isinstance(pap_data, dict):
-                self.pap_x_input.setText(pap_data.get("수평", ""))
-                self.pap_y_input.setText(pap_data.get("수직", ""))
-            elif isinstance(pap_data, str):
-                match = re.match(r"([\d\s/\.]+)\s*-\s*(-?[\d\s/\.]+)", pap_data)
-                if match:
-                    self.pap_x_input.setText(match.group(1).strip())
-                    self.pap_y_input.setText(match.group(2).strip())
-                else:
-                    self.pap_x_input.setText("")
-                    self.pap_y_input.setText("")
-            else:
-                self.pap_x_input.setText("")
-                self.pap_y_input.setText("")
-    
-            self.layout_input.setText(data.get("레이아웃", ""))
-            self.tilt_input.setText(data.get("틸트", ""))
-            self.rotation_input.setText(data.get("로테이션", ""))
-            self.memo_box.setPlainText(data.get("메모", ""))
-            self.center_toggle.setChecked(bool(data.get("토글상태", False)))
+            data = load_chart(list_model.key_at(index))
+    
+            form = decode_chart(data)
+            self.derived = data.get(DERIVED_KEY)
+            self.name_input.setText(form["name"])
+            self.id_input.setText(form["cid"])
+            for inp, value in zip(self.field_inputs, form["fields"]):
+                inp.setText(value)
+            self.pap_x_input.setText(form["pap_x"])
+            self.pap_y_input.setText(form["pap_y"])
+            self.layout_input.setText(form["layout"])
+            self.tilt_input.setText(form["tilt"])
+            self.rotation_input.setText(form["rotation"])
+            self.memo_box.setPlainText(form["memo"])
+            self.center_toggle.setChecked(form["toggle"])
     
             # ✅ 오른손/왼손
-            hand = data.get("hand", "오른손")
-            if hand == "왼손":
+            if form["hand"] == "왼손":
                 self.left_radio.setChecked(True)
             else:
                 self.right_radio.setChecked(True)
     
             # ✅ 클래식/덤리스
-            grip = data.get("그립방식", "클래식")
-            if grip == "덤리스":
-                self.thumbless_radio.setChecked(True)
-            else:
-                self.classic_radio.setChecked(True)
-                
-            grip = data.get("grip", "클래식")
-            if grip == "덤리스":
+            if form["grip"] == "덤리스":
                 self.thumbless_radio.setChecked(True)
             else:
                 self.classic_radio.setChecked(True)
@@ -881,7 +797,7 @@ class ChartWindow(QWidget):
             for inp in self.field_inputs:
                 inp.setPlaceholderText("")
     
-        list_widget.itemClicked.connect(on_item_selected)
+        list_view.clicked.connect(on_item_selected)
         result = dialog.exec_()
     
         if result == QDialog.Accepted:
@@ -932,98 +848,30 @@ class ChartWindow(QWidget):
         self.original_data = self.current_data.copy() if self.current_data else {}
         
         
-        def convert_fraction(value):
-            if not value:
-                return None
-            value = value.strip()
-        
-            if "mm" in value.lower():
-                return None  # 이미 변환된 값이면 무시
-        
-            try:
-                # 혼합분수 처리 ("1 1/4")
-                if ' ' in value and '/' in value:
-                    whole, frac = value.split()
-                    num, den = frac.split('/')
-                    return int(whole) + int(num) / int(den)
-        
-                # 단일 분수 처리 ("3/8")
-                elif '/' in value:
-                    num, den = value.split('/')
-                    return int(num) / int(den)
-        
-                # 정수 ("1") 또는 소수 ("1.5")
-                else:
-                    return float(value)
-        
-            except Exception as e:
-                print(f"[변환 오류] '{value}' → {e}")
-                return None
-
-        def inch_to_mm(inch_val):
-            return round(inch_val * 25.4, 2)
-
         # 중지/약지 사이즈 저장만
         for i in [0, 4]:
             raw = self.field_inputs[i].text().strip()
             self.original_values[i] = raw
 
+        # mm 값/엄지홀/좌표: 불러온 차트에 저장된 변환값이 지금 입력과 같으면 그대로 쓴다
+        hand = "왼손" if self.left_radio.isChecked() else "오른손"
+        derived = derived_for(form_inputs([f.text() for f in self.field_inputs], hand), self.derived)
+        mm_values = mm_by_index(derived)
+
         # 피치값 변환
         for i in [1, 2, 5, 6, 11, 12, 13, 14]:
             raw = self.field_inputs[i].text().strip()
             self.original_values[i] = raw
-            val_inch = convert_fraction(raw)
-            if val_inch is not None:
-                mm = inch_to_mm(val_inch)
-                self.field_inputs[i].setText(f"{mm:.2f} mm")
+            if i in mm_values:
+                self.field_inputs[i].setText(format_mm(mm_values[i]))
 
         # 엄지홀 오발 처리
         i = 10
         raw = self.field_inputs[i].text().strip()
         self.original_values[i] = raw
-        self.field_inputs[i].setText(parse_thumb_oblong_strict(raw))
-
-        # 좌표계산용 mm 값
-        def get_mm(index):
-            raw = self.field_inputs[index].text().replace(" mm", "").strip()
-            try:
-                return float(raw)
-            except:
-                return 0.0
-
-        left_mm = get_mm(11)
-        right_mm = get_mm(12)
-        reverse_mm = get_mm(13)
-        forward_mm = get_mm(14)
-
-        thumb_raw = self.field_inputs[10].text()
-        thumb_mm = 0.0
-        if ">" in thumb_raw:
-            try:
-                mm_part = thumb_raw.split(">")[1]
-                mm_extracted = re.findall(r"[\d.]+", mm_part)
-                if mm_extracted:
-                    thumb_mm = float(mm_extracted[0])
-            except:
-                thumb_mm = 0.0
-
-        if self.left_radio.isChecked():  # 왼손
-            fx = right_mm - left_mm - thumb_mm
-            fy = forward_mm - reverse_mm - thumb_mm
-            sx = right_mm - left_mm + thumb_mm
-            sy = forward_mm - reverse_mm + thumb_mm
-        else:  # 오른손
-            fx = right_mm - left_mm - thumb_mm
-            fy = forward_mm - reverse_mm + thumb_mm
-            sx = right_mm - left_mm + thumb_mm
-            sy = forward_mm - reverse_mm - thumb_mm
+        self.field_inputs[i].setText(derived["엄지홀"])
 
-        self.base_coords = {
-            "fx": fx,
-            "fy": fy,
-            "sx": sx,
-            "sy": sy
-        }
+        self.base_coords = dict(derived["좌표"])
     
         self.recalculate_offset_with_toggle()
         
@@ -1,10 +1,60 @@
-import os
-import json
+from chart_store import get_store, chart_key
+from chart_cache import CHART_CACHE
+from chart_record import ChartRecord
+from chart_schema import stamp
+from chart_derived import materialize, without_derived
+from schema_upgrader import upgrade_on_read, upgrade_stats
+from search_index import get_index
+from chart_history import record_revision, chart_as_of, list_revisions
+
+def _previous(store, key):
+    # 이전 저장본 (변환값 재사용 확인용, 없거나 읽을 수 없으면 None)
+    try:
+        return store.load(key) if store.exists(key) else None
+    except Exception:
+        return None
 
 def save_data_as_json(name, cid, data, folder="data"):
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    filename = f"{name}_{cid}.json"
-    filepath = os.path.join(folder, filename)
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+    store = get_store(folder)
+    data = stamp(materialize(data, _previous(store, chart_key(name, cid))))
+    key = store.save(name, cid, data)
+    get_index(folder).add(key)
+    record_revision(folder, key, without_derived(data))
+    return key
+
+def load_chart(key, folder="data"):
+    store = get_store(folder)
+    return upgrade_on_read(store, key, store.load(key))
+
+def load_record(key, folder="data"):
+    return ChartRecord.from_dict(load_chart(key, folder))
+
+def chart_exists(name, cid, folder="data"):
+    return get_store(folder).exists(chart_key(name, cid))
+
+def list_charts(folder="data"):
+    return get_store(folder).keys()
+
+def search_charts(text="", limit=None, folder="data"):
+    return get_index(folder).search(text, limit)
+
+def search_charts_page(text="", page=0, page_size=30, folder="data"):
+    return get_index(folder).page(text, page * page_size, page_size)
+
+def allocate_placeholder_id(base="이름", folder="data"):
+    return get_store(folder).allocate_placeholder(base)
+
+def latest_chart(folder="data"):
+    return get_store(folder).latest()
+
+def chart_history(key, folder="data"):
+    return list_revisions(folder, key)
+
+def load_chart_as_of(key, when, folder="data"):
+    return chart_as_of(folder, key, when)
+
+def cache_stats():
+    return CHART_CACHE.stats()
+
+def schema_upgrade_stats():
+    return upgrade_stats()
@@ -0,0 +1,126 @@
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chart_derived import PITCH_INDICES, derived_view, oriented
+from chart_record import OVERLAY_SLOTS
+from chart_schema import upgrade
+from chart_store import iter_chart_files, read_chart_file, chart_file_key
+from measurement import OK, ALREADY_MM, parse_pitch
+
+# 전체 차트의 mm 피치 값과 드릴 좌표표 만들기
+# 사용법: python export_coordinates.py [--data data] [--out coords.csv] [--format csv|ndjson]
+#                                      [--workers N] [--chunk 256]
+# - 차트마다 저장된 변환값(chart_derived.py)을 쓰고, 없거나 오래된 값이면 계산한다 (파일은 바꾸지 않음)
+# - 피치 _mm 칸은 좌표 계산에 쓴 값 (inch는 mm로 변환한 값, 이미 mm로 입력한 값은 그대로, 빈 값/해석 불가는 비움)
+# - 좌표는 기본 방향과 동서울그랜드볼링장(center_toggle) 방향을 모두 쓴다
+# - 파일 묶음(chunk) 단위로 여러 프로세스에 나눠 처리하므로 코어 수만큼 빨라진다
+# - --out을 주지 않으면 표준 출력으로 (진행 상황은 표준 에러로)
+
+COORD_COLUMNS = ["first_x", "first_y", "second_x", "second_y"]
+FIELDNAMES = (["key", "이름", "전화번호뒷자리", "hand"]
+              + [f"{OVERLAY_SLOTS[i]}_mm" for i in PITCH_INDICES]
+              + ["thumb_oblong"]
+              + COORD_COLUMNS
+              + [f"center_{c}" for c in COORD_COLUMNS])
+
+
+def chart_row(path):
+    data = upgrade(read_chart_file(path))[0]
+    derived = derived_view(data)
+    row = {
+        "key": chart_file_key(os.path.basename(path)),
+        "이름": data.get("이름", ""),
+        "전화번호뒷자리": data.get("전화번호뒷자리", ""),
+        "hand": derived["입력"][-1],
+    }
+    for i, text in zip(PITCH_INDICES, derived["입력"]):
+        mm, status = parse_pitch(text)
+        row[f"{OVERLAY_SLOTS[i]}_mm"] = mm if status in (OK, ALREADY_MM) else None
+    row["thumb_oblong"] = derived["엄지홀"]
+    for prefix, toggle in (("", False), ("center_", True)):
+        for column, value in zip(COORD_COLUMNS, oriented(derived["좌표"], toggle)):
+            row[prefix + column] = round(value, 2) + 0.0  # -0.0 -> 0.0
+    return row
+
+
+def rows_for(paths):
+    # 프로세스 하나가 처리하는 묶음: [(row, None) 또는 (None, 오류)]
+    result = []
+    for path in paths:
+        try:
+            result.append((chart_row(path), None))
+        except Exception as e:
+            result.append((None, f"{path} ({e})"))
+    return result
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class _CsvWriter:
+    def __init__(self, f):
+        self.writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow({k: ("" if v is None else v) for k, v in row.items()})
+
+
+class _NdjsonWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, row):
+        self.f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+
+WRITERS = {"csv": _CsvWriter, "ndjson": _NdjsonWriter}
+
+
+def export(folder="data", out=None, fmt="csv", workers=None, chunk=256):
+    counts = {"ok": 0, "error": 0}
+    start = time.time()
+    # CSV는 엑셀에서 한글이 깨지지 않도록 BOM을 붙인다
+    encoding = "utf-8-sig" if fmt == "csv" else "utf-8"
+    f = open(out, "w", encoding=encoding, newline="") if out else sys.stdout
+    try:
+        writer = WRITERS[fmt](f)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for rows in pool.map(rows_for, _chunks(iter_chart_files(folder), chunk)):
+                for row, error in rows:
+                    if error:
+                        counts["error"] += 1
+                        print(f"실패: {error}", file=sys.stderr)
+                        continue
+                    writer.write(row)
+                    counts["ok"] += 1
+                if counts["ok"] and counts["ok"] % 10000 < chunk:
+                    print(f"  {counts['ok']}개 ({time.time() - start:.1f}초)", file=sys.stderr)
+    finally:
+        if out:
+            f.close()
+    print(f"완료: {counts['ok']}개, 실패 {counts['error']} ({time.time() - start:.1f}초)", file=sys.stderr)
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 차트 mm/좌표표 만들기")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--out", default=None, help="결과 파일 (생략하면 표준 출력)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="csv")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk", type=int, default=256)
+    args = parser.parse_args()
+    export(args.data, args.out, args.format, args.workers, args.chunk)
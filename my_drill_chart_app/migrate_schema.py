@@ -0,0 +1,52 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from chart_store import iter_chart_files, read_chart_file, rewrite_chart_file
+from chart_schema import SCHEMA_VERSION, upgrade
+
+# 저장소 전체 차트를 최신 스키마로 올리는 도구
+# 사용법: python migrate_schema.py [--data data] [--workers N] [--dry-run]
+# - 이미 최신 버전인 파일은 건너뛰므로 중간에 멈춰도 다시 실행하면 남은 파일만 처리한다
+# - 압축 형식과 수정 시간은 그대로 유지
+# - 읽은 뒤에 앱에서 새로 저장된 파일은 덮어쓰지 않는다 (saved, 저장한 쪽이 이미 최신 형식)
+
+
+def upgrade_file(path, dry_run):
+    try:
+        data, signature = read_chart_file(path, with_signature=True)
+        new, changed = upgrade(data)
+        if changed and not dry_run and not rewrite_chart_file(path, new, signature):
+            return path, "saved", None
+        return path, "upgraded" if changed else "current", None
+    except Exception as e:
+        return path, "error", str(e)
+
+
+def migrate(folder="data", workers=None, dry_run=False):
+    paths = list(iter_chart_files(folder))
+    counts = {"upgraded": 0, "current": 0, "saved": 0, "error": 0}
+    start = time.time()
+    print(f"차트 {len(paths)}개 확인 (스키마 버전 {SCHEMA_VERSION}{', dry-run' if dry_run else ''})")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(upgrade_file, paths, [dry_run] * len(paths), chunksize=64)
+        for i, (path, status, error) in enumerate(results, 1):
+            counts[status] += 1
+            if error:
+                print(f"실패: {path} ({error})")
+            if i % 1000 == 0:
+                print(f"  {i}/{len(paths)} ({time.time() - start:.1f}초)")
+    label = "변환 대상" if dry_run else "변환"
+    print(f"완료: {label} {counts['upgraded']}, 최신 {counts['current']}, 변환 중 저장됨 {counts['saved']}, 실패 {counts['error']} "
+          f"({time.time() - start:.1f}초)")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="차트 JSON을 최신 스키마로 변환")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    migrate(args.data, args.workers, args.dry_run)
@@ -0,0 +1,28 @@
+import argparse
+import time
+
+from chart_store import SqliteChartStore
+
+# data 폴더의 SQLite 인덱스(charts.sqlite3)를 폴더 내용과 맞추는 도구
+# 사용법: python rebuild_index.py [--data data] [--full]
+# - 기본: 폴더에만 있는 파일은 추가하고 없어진 파일은 뺀다 (앱도 시작할 때 한 번 한다)
+# - --full: 모든 파일을 다시 읽어 처음부터 만든다 (인덱스가 깨졌거나 파일 내용을 앱 밖에서 고쳤을 때)
+
+
+def rebuild_index(folder="data", full=False):
+    store = SqliteChartStore(folder, reconcile=False)
+    start = time.time()
+    if full:
+        store.rebuild()
+        print(f"완료: 차트 {len(store.keys())}개로 다시 만듦 ({time.time() - start:.1f}초)")
+    else:
+        added, removed = store.reconcile()
+        print(f"완료: 추가 {added}, 삭제 {removed} ({time.time() - start:.1f}초)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="차트 검색 인덱스를 data 폴더와 맞추기")
+    parser.add_argument("--data", default="data")
+    parser.add_argument("--full", action="store_true")
+    args = parser.parse_args()
+    rebuild_index(args.data, args.full)
@@ -0,0 +1,60 @@
+import os
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# 차트 파일 직렬화 방식
+# - pretty: 기존과 같은 들여쓰기 JSON (기본값)
+# - compact: 공백 없이 키 정렬 (파일 크기 약 1/3)
+# - orjson: orjson이 설치되어 있으면 compact와 같은 형식을 더 빠르게
+# 읽기는 어떤 방식이든 JSON이면 되므로 예전 pretty 파일도 그대로 읽힌다.
+# CHART_SERIALIZER 환경변수로 선택
+
+
+class PrettyJsonSerializer:
+    name = "pretty"
+
+    def dumps(self, data):
+        return json.dumps(data, indent=4, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, raw):
+        return json.loads(raw)
+
+
+class CompactJsonSerializer(PrettyJsonSerializer):
+    name = "compact"
+
+    def dumps(self, data):
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True).encode("utf-8")
+
+
+class OrjsonSerializer:
+    name = "orjson"
+
+    def dumps(self, data):
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS)
+
+    def loads(self, raw):
+        return orjson.loads(raw)
+
+
+SERIALIZERS = {
+    "pretty": PrettyJsonSerializer,
+    "compact": CompactJsonSerializer,
+}
+if orjson is not None:
+    SERIALIZERS["orjson"] = OrjsonSerializer
+
+
+def get_serializer(name=None):
+    name = name or os.environ.get("CHART_SERIALIZER", "pretty")
+    if name not in SERIALIZERS:
+        print(f"알 수 없는 직렬화 방식 '{name}', compact 사용")
+        name = "compact"
+    return SERIALIZERS[name]()
+
+
+SERIALIZER = get_serializer()
@@ -0,0 +1,60 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from chart_schema import SCHEMA_VERSION, schema_version, upgrade
+from chart_store import read_chart_file, rewrite_chart_file
+
+# 불러올 때 예전 스키마면 메모리에서 한 번 올리고, 파일은 백그라운드에서 새 형식으로 다시 쓴다
+# 자주 여는 차트부터 자연스럽게 최신 형식이 되고, 다음부터는 변환 없이 읽힌다.
+# UPGRADE_STATS가 0에 가까워지면 app.py 불러오기 코드의 구버전 처리(PAP 문자열 등)를 지워도 된다.
+
+UPGRADE_STATS = {"checked": 0, "upgraded": 0, "written_back": 0, "write_back_skipped": 0, "write_back_failed": 0}
+UPGRADES_FROM = {}  # 원래 버전 -> 횟수
+
+_lock = threading.Lock()
+_pending = set()
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-upgrade")
+
+
+def _write_back(store, key):
+    try:
+        path = store.locate(key)
+        # 그 사이 새로 저장되었으면 건드리지 않는다 (읽은 뒤 쓰기 직전에 저장된 경우도)
+        data, signature = read_chart_file(path, with_signature=True)
+        written = schema_version(data) < SCHEMA_VERSION and rewrite_chart_file(path, upgrade(data)[0], signature)
+        with _lock:
+            UPGRADE_STATS["written_back" if written else "write_back_skipped"] += 1
+    except Exception as e:
+        print(f"스키마 저장 실패: {key} ({e})")
+        with _lock:
+            UPGRADE_STATS["write_back_failed"] += 1
+    finally:
+        with _lock:
+            _pending.discard((id(store), key))
+
+
+def upgrade_on_read(store, key, data):
+    version = schema_version(data)
+    with _lock:
+        UPGRADE_STATS["checked"] += 1
+    if version >= SCHEMA_VERSION:
+        return data
+    data, _ = upgrade(data)
+    with _lock:
+        UPGRADE_STATS["upgraded"] += 1
+        UPGRADES_FROM[version] = UPGRADES_FROM.get(version, 0) + 1
+        if (id(store), key) in _pending:
+            return data
+        _pending.add((id(store), key))
+    _executor.submit(_write_back, store, key)
+    return data
+
+
+def upgrade_stats():
+    with _lock:
+        return dict(UPGRADE_STATS, from_versions=dict(UPGRADES_FROM))
+
+
+def wait_for_write_backs():
+    # 테스트/종료 전 대기용
+    _executor.submit(lambda: None).result()
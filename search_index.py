@@ -0,0 +1,192 @@
+import bisect
+import heapq
+import itertools
+import os
+import threading
+from array import array
+
+from chart_store import get_store
+
+# 고객 검색 인덱스 (메모리)
+# - 3글자 이상: trigram 목록 중 가장 짧은 것만 후보로 보고 `query in key`로 확인
+# - 2글자: bigram 목록으로 같은 방식
+# - 1글자: 글자별 목록 (기존과 같이 어디에 있든 찾는다, "C"/"T"로 끝나는 차트도)
+# 검색 대상 문자열은 기존과 같은 "{이름}_{전화번호}" (파일 이름에서 .json을 뺀 것)
+# 초성 검색: 검색어에 ㄱ~ㅎ이 들어 있으면 미리 만들어 둔 초성 문자열("ㅅㅎㄱ_8781")에서 찾는다
+# ("ㅅㅎㄱ", "신ㅎㄱ" 처럼 섞어 써도 됨, 초성 1글자는 이름 첫 글자의 초성으로 찾기)
+
+CHOSUNG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+CHOSUNG_SET = set(CHOSUNG) | set("ㄳㄵㄶㄺㄻㄼㄽㄾㄿㅀㅄ")
+
+
+def ngrams(text, n):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def to_chosung(text):
+    # 한글 음절은 초성으로, 나머지 글자는 그대로
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        out.append(CHOSUNG[code // 588] if 0 <= code < 11172 else ch)
+    return "".join(out)
+
+
+def has_chosung(text):
+    return any(ch in CHOSUNG_SET for ch in text)
+
+
+def chosung_match(query, key, cho):
+    # query의 초성 글자는 cho와, 나머지 글자는 key와 같은 위치에서 비교
+    targets = [cho if ch in CHOSUNG_SET else key for ch in query]
+    n = len(query)
+    for start in range(len(key) - n + 1):
+        if all(targets[j][start + j] == query[j] for j in range(n)):
+            return True
+    return False
+
+
+class ChartSearchIndex:
+    def __init__(self, store=None):
+        self.store = store
+        self._lock = threading.RLock()
+        self._marker = None
+        self._reset()
+
+    def _reset(self):
+        self._keys = []          # id -> key
+        self._ids = {}           # key -> id
+        self._sorted = []        # 정렬된 key 목록 (빈 검색어)
+        self._postings = {}      # 글자/bigram/trigram -> array of id
+        self._cho = []           # id -> 초성 문자열
+        self._cho_sorted = []    # 정렬된 (초성 문자열, key) 목록 (초성 1글자 prefix)
+        self._cho_postings = {}  # 초성이 들어간 bigram/trigram -> array of id
+
+    def build(self, keys):
+        with self._lock:
+            self._reset()
+            for key in sorted(keys):
+                self._add(key, keep_sorted=False)
+            self._sorted = sorted(self._keys)
+            self._cho_sorted.sort()
+
+    def add(self, key):
+        with self._lock:
+            self._add(key, keep_sorted=True)
+
+    def _add(self, key, keep_sorted):
+        if key in self._ids:
+            return
+        key_id = len(self._keys)
+        self._keys.append(key)
+        self._ids[key] = key_id
+        cho = to_chosung(key)
+        self._cho.append(cho)
+        if keep_sorted:
+            bisect.insort(self._sorted, key)
+            bisect.insort(self._cho_sorted, (cho, key))
+        else:
+            self._cho_sorted.append((cho, key))
+        for gram in ngrams(key, 1) | ngrams(key, 2) | ngrams(key, 3):
+            self._post(self._postings, gram, key_id)
+        for gram in ngrams(cho, 2) | ngrams(cho, 3):
+            if has_chosung(gram):
+                self._post(self._cho_postings, gram, key_id)
+
+    def _post(self, postings, gram, key_id):
+        posting = postings.get(gram)
+        if posting is None:
+            posting = postings[gram] = array("I")
+        posting.append(key_id)
+
+    def sync(self):
+        # 다른 프로세스(PyQt 앱, 다른 Streamlit 서버)가 저장한 차트도 반영
+        if self.store is None:
+            return
+        marker, keys = self.store.keys_since(self._marker)
+        with self._lock:
+            if keys is None:
+                self.build(self.store.keys())
+            else:
+                for key in keys:
+                    self._add(key, keep_sorted=True)
+            self._marker = marker
+
+    def _candidates(self, query):
+        # 가장 짧은 posting 목록의 key 중 실제로 query를 포함하는 것만
+        n = min(len(query), 3)
+        if has_chosung(query):
+            postings = self._cho_postings
+            grams = [g for g in ngrams(to_chosung(query), n) if has_chosung(g)]
+        else:
+            postings = self._postings
+            grams = ngrams(query, n)
+        best = None
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                return ()
+            if best is None or len(posting) < len(best):
+                best = posting
+        if postings is self._cho_postings:
+            return (self._keys[i] for i in best if chosung_match(query, self._keys[i], self._cho[i]))
+        return (self._keys[i] for i in best if query in self._keys[i])
+
+    def _prefix(self, items, prefix, pick):
+        start = bisect.bisect_left(items, (prefix,) if pick else prefix)
+        for item in items[start:]:
+            value = item[0] if pick else item
+            if not value.startswith(prefix):
+                break
+            yield item[1] if pick else item
+
+    def matches(self, query):
+        with self._lock:
+            if not query:
+                return list(self._sorted)
+            if len(query) == 1 and has_chosung(query):
+                return sorted(self._prefix(self._cho_sorted, query, True))
+            return sorted(self._candidates(query))
+
+    def search(self, query="", limit=None):
+        self.sync()
+        with self._lock:
+            if limit and len(query) == 1 and has_chosung(query):
+                return list(itertools.islice(self._prefix(self._cho_sorted, query, True), limit))
+            if limit and len(query) == 1 and len(self._postings.get(query, ())) * 4 > len(self._keys):
+                # 4개 중 1개 이상에 들어 있는 글자 ("_", 숫자): 긴 목록으로 heap을 만드는 것보다
+                # 정렬된 key를 앞에서부터 보고 limit개에서 멈추는 편이 빠르다 (끝까지 봐도 비슷)
+                return list(itertools.islice((k for k in self._sorted if query in k), limit))
+            if limit and query:
+                return heapq.nsmallest(limit, self._candidates(query))
+            if limit:
+                return self._sorted[:limit]
+            found = self.matches(query)
+        return found[:limit] if limit else found
+
+    def page(self, query="", offset=0, limit=30):
+        # (전체 건수, offset부터 limit개) - 화면에는 한 페이지만 보낸다
+        self.sync()
+        with self._lock:
+            if not query:
+                return len(self._sorted), self._sorted[offset:offset + limit]
+            found = self.matches(query)
+        return len(found), found[offset:offset + limit]
+
+    def __len__(self):
+        return len(self._keys)
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_index(folder="data"):
+    # 폴더별 인덱스 하나를 프로세스 전체(모든 Streamlit 세션)가 공유
+    path = os.path.abspath(folder)
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = ChartSearchIndex(get_store(folder))
+            _indexes[path] = index
+    return index